@@ -13,26 +13,53 @@ For detailed implementation, see the reviewer package modules:
 - github_client.py: GitHub API operations
 - openrouter_client.py: OpenRouter AI integration
 - prompt_builder.py: Prompt construction
+- review_cache.py: Cache of reviews for unchanged diffs
 - utils.py: Helper functions
 """
 
+import argparse
 import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from reviewer.config import Config
 from reviewer.github_client import GitHubClient, GitHubAPIError
 from reviewer.openrouter_client import OpenRouterClient, OpenRouterAPIError
 from reviewer.prompt_builder import PromptBuilder
+from reviewer.review_cache import ReviewCache
 from reviewer.utils import (
-    get_pr_number_from_ref,
+    get_pr_numbers,
     format_validation_errors,
     create_fallback_comment,
+    create_generated_only_comment,
+    create_whitespace_only_comment,
     print_usage_instructions
 )
 
+# (summary, part title, "more files" suffix) used when merging chunk reviews
+_MERGE_TEMPLATES_EN = (
+    "## 📋 Code Review Summary\n\n_This PR was reviewed in {count} parts due to size._\n\n",
+    "\n---\n\n### Part {number}: {files}{more_files}\n\n",
+    " and {count} more files",
+)
+_MERGE_TEMPLATES_VI = (
+    "## 📋 Tổng Hợp Code Review\n\n_PR này được review theo {count} phần do kích thước lớn._\n\n",
+    "\n---\n\n### Phần {number}: {files}{more_files}\n\n",
+    " và {count} files khác",
+)
+
+# Concurrency limits per pipeline stage when several PRs are reviewed at once
+_GITHUB_SLOTS = threading.BoundedSemaphore(Config.MAX_CONCURRENT_GITHUB_CALLS)
+_LLM_SLOTS = threading.BoundedSemaphore(Config.MAX_CONCURRENT_LLM_CALLS)
+
 
 def main():
     """Main entry point for AI code review workflow."""
 
+    args = _parse_args()
+
     # Print environment configuration for debugging
     Config.print_debug_info()
 
@@ -45,115 +72,272 @@ def main():
             print(format_validation_errors(critical_errors))
             sys.exit(1)
 
-    # Extract PR number from GitHub ref
-    pr_number = get_pr_number_from_ref(Config.GITHUB_REF)
-    if not pr_number:
+    # PR numbers: --prs / GITHUB_PR_NUMBERS (batch mode) or the GitHub ref
+    pr_numbers = get_pr_numbers(Config.GITHUB_REF, args.prs or Config.GITHUB_PR_NUMBERS)
+    if not pr_numbers:
         print_usage_instructions(Config.GITHUB_REF)
         sys.exit(0)
 
-    # Initialize clients
+    # Initialize shared components once; they are reused across PRs
     github_client = GitHubClient(Config.GITHUB_REPOSITORY, Config.GITHUB_TOKEN)
-    openrouter_client = OpenRouterClient(
+    prompt_builder = PromptBuilder(Config.REVIEW_LANGUAGE)
+    review_cache = ReviewCache(Config.REVIEW_CACHE_DIR, Config.REVIEW_CACHE_TTL)
+    review_cache.prune()
+
+    if len(pr_numbers) == 1:
+        results = [_review_pr(pr_numbers[0], github_client, prompt_builder, review_cache)]
+    else:
+        # Pipeline PRs: while one PR waits on the AI, others fetch diffs or post
+        # comments. Per-stage semaphores in _review_pr bound each API's load.
+        print(f"📦 Batch mode: reviewing {len(pr_numbers)} PRs "
+              f"(up to {Config.MAX_PARALLEL_PRS} in parallel)")
+        with ThreadPoolExecutor(max_workers=Config.MAX_PARALLEL_PRS) as executor:
+            futures = []
+            for pr_number in pr_numbers:
+                futures.append(executor.submit(
+                    _review_pr, pr_number, github_client, prompt_builder, review_cache
+                ))
+                # Stagger starts to stay under GitHub's secondary rate limits
+                time.sleep(Config.GITHUB_BATCH_DELAY)
+            results = []
+            for pr_number, future in zip(pr_numbers, futures):
+                # One PR crashing must not lose the other results (and the summary)
+                try:
+                    results.append(future.result())
+                except Exception:
+                    print(f"❌ Unexpected error reviewing PR #{pr_number}:\n"
+                          f"{traceback.format_exc()}", end="")
+                    results.append(False)
+
+    github_client.close()
+    failed_prs = [n for n, ok in zip(pr_numbers, results) if not ok]
+
+    if failed_prs:
+        if len(pr_numbers) > 1:
+            print(f"❌ Review failed for PR(s): {', '.join('#' + n for n in failed_prs)}")
+        sys.exit(1)
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="AI code review for Flutter PRs")
+    parser.add_argument(
+        "--prs",
+        default="",
+        help="Comma-separated PR numbers to review in one run "
+             "(overrides GITHUB_PR_NUMBERS and GITHUB_REF)"
+    )
+    return parser.parse_args()
+
+
+def _review_pr(pr_number: str, github_client: GitHubClient,
+               prompt_builder: PromptBuilder, review_cache: ReviewCache) -> bool:
+    """Review a single PR and post the result as a comment.
+
+    Args:
+        pr_number: Pull request number
+        github_client: Shared GitHub client
+        prompt_builder: Shared prompt builder
+        review_cache: Cache of reviews from previous runs
+
+    Returns:
+        True if the review was posted, False on failure
+    """
+    with OpenRouterClient(
         Config.OPENROUTER_API_KEY,
         project_name=Config.GITHUB_REPOSITORY or "AI Code Review Bot",
         pr_number=pr_number
-    )
-    prompt_builder = PromptBuilder(Config.REVIEW_LANGUAGE)
+    ) as openrouter_client:
+        return _run_review(
+            pr_number, github_client, openrouter_client, prompt_builder, review_cache
+        )
+
+
+def _run_review(pr_number: str, github_client: GitHubClient,
+                openrouter_client: OpenRouterClient,
+                prompt_builder: PromptBuilder, review_cache: ReviewCache) -> bool:
+    """Fetch, review and comment on a PR using a per-PR OpenRouter client.
+
+    Args:
+        pr_number: Pull request number
+        github_client: Shared GitHub client
+        openrouter_client: OpenRouter client for this PR
+        prompt_builder: Shared prompt builder
+        review_cache: Cache of reviews from previous runs
+
+    Returns:
+        True if the review was posted, False on failure
+    """
+    language = Config.REVIEW_LANGUAGE
+    header = Config.COMMENT_HEADER
 
     # Step 1: Fetch PR diff
     try:
         print(f"🔍 Fetching diff for PR #{pr_number}...")
-        diff = github_client.fetch_pr_diff(pr_number)
+        with _GITHUB_SLOTS:
+            diff = github_client.fetch_pr_diff(pr_number)
     except GitHubAPIError as e:
         print(f"❌ Failed to fetch PR diff: {e}")
-        sys.exit(1)
+        return False
+
+    # Skip the AI entirely for PRs that only regenerate files
+    if prompt_builder.chunker.is_generated_only(diff):
+        print("✅ Only generated/lock files changed, skipping AI review")
+        comment = create_generated_only_comment(
+            language,
+            prompt_builder.chunker.get_file_paths(diff)
+        )
+        try:
+            with _GITHUB_SLOTS:
+                github_client.post_comment(pr_number, header + comment)
+        except GitHubAPIError as e:
+            print(f"❌ Failed to post comment: {e}")
+            return False
+        return True
+
+    # Generated files in a mixed PR only cost tokens; review the rest
+    diff, omitted_files = prompt_builder.chunker.strip_generated_files(diff)
+    if omitted_files:
+        print(f"✂️  Leaving {len(omitted_files)} generated/lock file(s) out of the prompt: "
+              f"{', '.join(omitted_files[:5])}{'...' if len(omitted_files) > 5 else ''}")
+
+    # Formatting-only PRs (re-indent, reflow) have nothing to review either
+    if prompt_builder.chunker.is_whitespace_only(diff):
+        print("✅ Only whitespace changed, skipping AI review")
+        try:
+            with _GITHUB_SLOTS:
+                github_client.post_comment(
+                    pr_number, header + create_whitespace_only_comment(language)
+                )
+        except GitHubAPIError as e:
+            print(f"❌ Failed to post comment: {e}")
+            return False
+        return True
 
     # Step 2: Build review prompts (may be chunked for large PRs)
     print("📝 Building review prompt(s)...")
     prompt_chunks = prompt_builder.build_chunked_prompts(diff)
+    cacheable_prefix = prompt_builder.get_cacheable_prefix()
 
     # Step 3: Generate AI review for each chunk
+    def review_chunk(idx: int, prompt: str, chunk) -> str:
+        # Runs on worker threads: one write per line so lines don't interleave
+        if len(prompt_chunks) > 1:
+            print(f"💬 Reviewing chunk {idx + 1}/{len(prompt_chunks)} "
+                  f"({len(chunk.files)} files: {', '.join(chunk.files[:3])}...)\n", end="")
+        else:
+            print("💬 Sending prompt to OpenRouter AI...\n", end="")
+
+        # Keyed by the chunk's diff rather than the whole prompt, so a chunk
+        # whose part number shifted between pushes still hits the cache
+        cache_key = cacheable_prefix + chunk.content
+        review = review_cache.get(cache_key)
+        if review:
+            print(f"   ♻️  Chunk {idx + 1} unchanged since a previous run, "
+                  f"reusing cached review\n", end="")
+            return review
+
+        with _LLM_SLOTS:
+            review, model_name = openrouter_client.generate_review_with_model(
+                prompt, cacheable_prefix
+            )
+        review_cache.put(cache_key, review, model_name)
+        return review
+
+    # Chunks are independent, so they are reviewed concurrently (bounded by
+    # _LLM_SLOTS) and collected in order for merging
     all_reviews = []
-    for idx, (prompt, chunk) in enumerate(prompt_chunks):
-        try:
-            if len(prompt_chunks) > 1:
-                print(f"💬 Reviewing chunk {idx + 1}/{len(prompt_chunks)} "
-                      f"({len(chunk.files)} files: {', '.join(chunk.files[:3])}...)")
-            else:
-                print("💬 Sending prompt to OpenRouter AI...")
-
-            review = openrouter_client.generate_review(prompt)
-            all_reviews.append({
-                'chunk_index': idx,
-                'files': chunk.files,
-                'review': review
-            })
-
-        except OpenRouterAPIError as e:
-            print(f"❌ OpenRouter call failed for chunk {idx + 1}: {e}")
-
-            # If first chunk fails, post fallback comment and exit
-            if idx == 0:
-                fallback_comment = create_fallback_comment(
-                    Config.REVIEW_LANGUAGE,
-                    str(e)
-                )
-                try:
-                    github_client.post_comment(
-                        pr_number,
-                        Config.COMMENT_HEADER + fallback_comment
+    max_workers = min(len(prompt_chunks), Config.MAX_CONCURRENT_LLM_CALLS)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(review_chunk, idx, prompt, chunk)
+            for idx, (prompt, chunk) in enumerate(prompt_chunks)
+        ]
+
+        for idx, ((prompt, chunk), future) in enumerate(zip(prompt_chunks, futures)):
+            try:
+                all_reviews.append({
+                    'chunk_index': idx,
+                    'files': chunk.files,
+                    'review': future.result()
+                })
+
+            except OpenRouterAPIError as e:
+                print(f"❌ OpenRouter call failed for chunk {idx + 1}: {e}")
+
+                # If first chunk fails, post fallback comment and stop
+                if idx == 0:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    fallback_comment = create_fallback_comment(
+                        language,
+                        str(e)
                     )
-                except Exception:
-                    pass
-                sys.exit(1)
-            else:
-                # For subsequent chunks, log error but continue
-                print(f"   ⚠️ Skipping chunk {idx + 1}, continuing with remaining chunks...")
-                continue
-
-        except Exception as e:
-            # Catch any unexpected errors with full traceback
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"❌ Unexpected error in chunk {idx + 1}:")
-            print(error_details)
-
-            if idx == 0:
-                fallback_comment = create_fallback_comment(
-                    Config.REVIEW_LANGUAGE,
-                    f"Unexpected error: {str(e)}\n\nTraceback:\n{error_details}"
-                )
-                try:
-                    github_client.post_comment(
-                        pr_number,
-                        Config.COMMENT_HEADER + fallback_comment
+                    try:
+                        with _GITHUB_SLOTS:
+                            github_client.post_comment(
+                                pr_number,
+                                header + fallback_comment
+                            )
+                    except Exception:
+                        pass
+                    return False
+                else:
+                    # For subsequent chunks, log error but continue
+                    print(f"   ⚠️ Skipping chunk {idx + 1}, continuing with remaining chunks...")
+                    continue
+
+            except Exception as e:
+                if idx == 0:
+                    # Full traceback only where it is shown in the fallback comment
+                    error_details = traceback.format_exc()
+                    print(f"❌ Unexpected error in chunk {idx + 1}:")
+                    print(error_details)
+
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    fallback_comment = create_fallback_comment(
+                        language,
+                        f"Unexpected error: {str(e)}\n\nTraceback:\n{error_details}"
                     )
-                except Exception:
-                    pass
-                sys.exit(1)
-            else:
-                print(f"   ⚠️ Skipping chunk {idx + 1}, continuing with remaining chunks...")
-                continue
+                    try:
+                        with _GITHUB_SLOTS:
+                            github_client.post_comment(
+                                pr_number,
+                                header + fallback_comment
+                            )
+                    except Exception:
+                        pass
+                    return False
+                else:
+                    print(f"❌ Unexpected error in chunk {idx + 1}: {e!r}")
+                    print(f"   ⚠️ Skipping chunk {idx + 1}, continuing with remaining chunks...")
+                    continue
 
     # Step 4: Merge reviews if multiple chunks
     if len(all_reviews) == 0:
         print("❌ No reviews generated")
-        sys.exit(1)
+        return False
 
     if len(all_reviews) == 1:
         final_review = all_reviews[0]['review']
     else:
         print(f"🔗 Merging {len(all_reviews)} review chunks...")
-        final_review = _merge_reviews(all_reviews, Config.REVIEW_LANGUAGE)
+        final_review = _merge_reviews(all_reviews, language)
 
     # Step 5: Post review to PR
     try:
-        print("✉️ Posting review comment(s) to PR...")
-        github_client.post_review_chunked(pr_number, final_review.strip())
+        print(f"✉️ Posting review comment(s) to PR #{pr_number}...")
+        with _GITHUB_SLOTS:
+            github_client.post_review_chunked(pr_number, final_review.strip())
         print("✅ Posted AI review comment(s) successfully.")
     except GitHubAPIError as e:
         print(f"❌ Failed to post comment: {e}")
-        sys.exit(1)
+        return False
+
+    return True
 
 
 def _merge_reviews(reviews: list, language: str) -> str:
@@ -166,35 +350,24 @@ def _merge_reviews(reviews: list, language: str) -> str:
     Returns:
         Merged review text
     """
-    if language == "english":
-        header = "## 📋 Code Review Summary\n\n"
-        header += f"_This PR was reviewed in {len(reviews)} parts due to size._\n\n"
-    else:
-        header = "## 📋 Tổng Hợp Code Review\n\n"
-        header += f"_PR này được review theo {len(reviews)} phần do kích thước lớn._\n\n"
-
-    merged = header
+    summary_template, part_template, more_files_template = (
+        _MERGE_TEMPLATES_EN if language == "english" else _MERGE_TEMPLATES_VI
+    )
 
+    parts = [summary_template.format(count=len(reviews))]
     for review_data in reviews:
-        chunk_idx = review_data['chunk_index']
         files = review_data['files']
-        review = review_data['review']
-
-        # Add separator between chunks
-        if language == "english":
-            merged += f"\n---\n\n### Part {chunk_idx + 1}: {', '.join(files[:3])}"
-            if len(files) > 3:
-                merged += f" and {len(files) - 3} more files"
-            merged += "\n\n"
-        else:
-            merged += f"\n---\n\n### Phần {chunk_idx + 1}: {', '.join(files[:3])}"
-            if len(files) > 3:
-                merged += f" và {len(files) - 3} files khác"
-            merged += "\n\n"
+        more_files = more_files_template.format(count=len(files) - 3) if len(files) > 3 else ""
 
-        merged += review.strip() + "\n"
+        # Separator and title for each chunk, then its review
+        parts.append(part_template.format(
+            number=review_data['chunk_index'] + 1,
+            files=', '.join(files[:3]),
+            more_files=more_files
+        ))
+        parts.append(review_data['review'].strip() + "\n")
 
-    return merged
+    return "".join(parts)
 
 
 if __name__ == '__main__':
@@ -1,30 +1,51 @@
 """AI Code Reviewer Package for Flutter/Dart projects using OpenRouter AI."""
 
+import importlib
+
+from .config import Config  # Only needs os; everything else loads on demand
+
 __version__ = "3.0.0"
 
-from .config import Config
-from .github_client import GitHubClient, GitHubAPIError
-from .openrouter_client import OpenRouterClient, OpenRouterAPIError
-from .prompt_builder import PromptBuilder
-from .diff_chunker import DiffChunker, DiffChunk
-from .utils import (
-    get_pr_number_from_ref,
-    format_validation_errors,
-    create_fallback_comment,
-    print_usage_instructions
-)
-
-__all__ = [
-    "Config",
-    "GitHubClient",
-    "GitHubAPIError",
-    "OpenRouterClient",
-    "OpenRouterAPIError",
-    "PromptBuilder",
-    "DiffChunker",
-    "DiffChunk",
-    "get_pr_number_from_ref",
-    "format_validation_errors",
-    "create_fallback_comment",
-    "print_usage_instructions",
-]
+# Public name -> submodule defining it. Submodules are imported on first
+# attribute access (PEP 562), so `import reviewer.config` does not pull in
+# requests and every other module through this package's __init__.
+_EXPORTS = {
+    "GitHubClient": "github_client",
+    "GitHubAPIError": "github_client",
+    "OpenRouterClient": "openrouter_client",
+    "OpenRouterAPIError": "openrouter_client",
+    "OpenRouterRateLimitError": "openrouter_client",
+    "OpenRouterUnavailableError": "openrouter_client",
+    "OpenRouterAuthError": "openrouter_client",
+    "OpenRouterCreditsError": "openrouter_client",
+    "PromptBuilder": "prompt_builder",
+    "DiffChunker": "diff_chunker",
+    "DiffChunk": "diff_chunker",
+    "ReviewCache": "review_cache",
+    "TokenBucket": "rate_limit",
+    "get_pr_number_from_ref": "utils",
+    "get_pr_numbers": "utils",
+    "format_validation_errors": "utils",
+    "create_fallback_comment": "utils",
+    "create_generated_only_comment": "utils",
+    "create_whitespace_only_comment": "utils",
+    "print_usage_instructions": "utils",
+}
+
+__all__ = ["Config", *_EXPORTS]
+
+
+def __getattr__(name: str):
+    """Import the submodule defining a public name on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    """List lazily exported names alongside the loaded ones."""
+    return sorted({*globals(), *__all__})
@@ -9,12 +9,18 @@ import os
 class Config:
     """Configuration class for managing environment variables and constants."""
 
-    # Environment variables
-    OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-    GITHUB_REPOSITORY = os.getenv("GITHUB_REPOSITORY")
-    GITHUB_REF = os.getenv("GITHUB_REF", "")
-    REVIEW_LANGUAGE = os.getenv("REVIEW_LANGUAGE", "vietnamese").lower()
+    # Environment variables, set by load_env() (called at import)
+    OPENROUTER_API_KEY = None
+    GITHUB_TOKEN = None
+    GITHUB_REPOSITORY = None
+    GITHUB_REF = ""
+    GITHUB_PR_NUMBERS = ""  # Batch mode, e.g. "12,15,18"
+    REVIEW_LANGUAGE = "vietnamese"
+
+    # Reviews cached by prompt hash so re-runs on an unchanged diff skip the AI
+    REVIEW_CACHE_DIR = "~/.cache/ai-review"  # AI_REVIEW_CACHE_DIR
+    REVIEW_CACHE_TTL = 604800  # AI_REVIEW_CACHE_TTL, seconds (7 days), 0 disables
+    _INVALID_CACHE_TTL = None  # Raw AI_REVIEW_CACHE_TTL if it was not a number
 
     # OpenRouter model configuration
     # Model is controlled by project maintainers, users cannot override
@@ -27,14 +33,37 @@ class Config:
     #   - "openai/gpt-4-turbo" (High quality)
     OPENROUTER_MODEL = "z-ai/glm-4.5-air:free"
 
+    # Models tried in order when OPENROUTER_MODEL is rate limited. Free models
+    # have separate quotas, so switching right away beats sleeping through the
+    # retry backoff. Only the last model in the chain waits and retries.
+    # Example: ("google/gemini-2.0-flash-exp:free", "x-ai/grok-4.1-fast:free")
+    OPENROUTER_FALLBACK_MODELS = ()
+
     # Constants
     MAX_DIFF_LENGTH = 100000  # Limit diff size to avoid huge token payloads (increased from 12k)
+    MAX_DIFF_BYTES = 5_000_000  # Stop downloading the diff past this size
     MAX_COMMENT_LENGTH = 60000  # GitHub has 65,536 char limit, use 60k for safety
+    MAX_PARALLEL_COMMENT_POSTS = 3  # Parts of a long review posted concurrently
+    COMMENT_POST_STAGGER = 0.05  # seconds between starting those posts (keeps their order)
     COMMENT_HEADER = "🤖 **AI Code Review - Flutter (OpenRouter)**\n\n"
 
     # Diff processing settings
     WARN_DIFF_TRUNCATED = True  # Warn in prompt if diff was truncated
 
+    # Generated / lock files. They are left out of the prompt, and a PR
+    # touching only these is not sent to the AI.
+    # '*' and '?' don't match '/'. Patterns without '/' match the file name in
+    # any directory, others match the path from the repository root.
+    GENERATED_FILE_PATTERNS = (
+        "*.g.dart",
+        "*.freezed.dart",
+        "*.mocks.dart",
+        "*.gr.dart",
+        "pubspec.lock",
+        "Podfile.lock",
+        "app_localizations*.dart",  # flutter gen-l10n output (the .arb sources are reviewed)
+    )
+
     # OpenRouter generation settings
     GENERATION_CONFIG = {
         "temperature": 0.7,
@@ -46,10 +75,69 @@ class Config:
     # This is controlled by project, users cannot override
     ENABLE_REASONING = True  # Set to False to disable reasoning
 
+    # Mark the static part of the prompt (template + coding rules) as cacheable
+    # so providers that support prompt caching (Anthropic, Gemini via OpenRouter)
+    # reuse it instead of re-processing the same tokens on every request
+    ENABLE_PROMPT_CACHING = True
+
+    # Stream the completion (SSE) and assemble it as tokens arrive instead of
+    # waiting for the whole response body
+    STREAM_RESPONSE = True
+    STREAM_IDLE_TIMEOUT = 60  # seconds without any bytes (keep-alives count) before giving up
+    STREAM_MAX_DURATION = 300  # wall-clock budget for one streamed completion
+    REQUEST_CONNECT_TIMEOUT = 10  # seconds
+
     # Retry configuration
     MAX_RETRIES = 2
     INITIAL_RETRY_DELAY = 5  # seconds
     RETRY_BACKOFF_MULTIPLIER = 2
+    MAX_RETRY_AFTER = 60  # seconds; give up instead of waiting longer on a 429
+
+    # Client-side rate limits (token buckets, shared by all threads): requests
+    # wait locally instead of drawing 429s. 0 disables a limit.
+    OPENROUTER_REQUESTS_PER_MINUTE = 20  # OpenRouter's limit for free models
+    OPENROUTER_BURST = 3
+    GITHUB_COMMENTS_PER_MINUTE = 60  # Below GitHub's content-creation secondary limit
+    GITHUB_COMMENT_BURST = 5
+
+    # Circuit breaker: a fallback model that failed this many times in a row is
+    # skipped (by every chunk/PR in the run) until the cooldown has passed
+    CIRCUIT_BREAKER_FAILURES = 2
+    CIRCUIT_BREAKER_COOLDOWN = 60  # seconds before one probe request is let through
+
+    # Batch mode concurrency (only used when several PRs are reviewed in one run)
+    MAX_PARALLEL_PRS = 3
+    MAX_CONCURRENT_GITHUB_CALLS = 5
+    MAX_CONCURRENT_LLM_CALLS = 2  # Keep low for free-tier model rate limits
+    GITHUB_BATCH_DELAY = 0.2  # seconds between PR starts
+
+    @classmethod
+    def load_env(cls, environ=None):
+        """Load the environment-derived settings from a single snapshot.
+
+        Called once at import. Tests or embedding code can call it again with
+        a custom mapping instead of patching os.environ before import.
+
+        Args:
+            environ: Mapping to read from (defaults to os.environ)
+        """
+        env = dict(os.environ if environ is None else environ)
+        cls.OPENROUTER_API_KEY = env.get("OPENROUTER_API_KEY")
+        cls.GITHUB_TOKEN = env.get("GITHUB_TOKEN")
+        cls.GITHUB_REPOSITORY = env.get("GITHUB_REPOSITORY")
+        cls.GITHUB_REF = env.get("GITHUB_REF", "")
+        cls.GITHUB_PR_NUMBERS = env.get("GITHUB_PR_NUMBERS", "")
+        cls.REVIEW_LANGUAGE = env.get("REVIEW_LANGUAGE", "vietnamese").lower()
+        cls.REVIEW_CACHE_DIR = env.get("AI_REVIEW_CACHE_DIR", "~/.cache/ai-review")
+        # Parsed here but reported by validate(), so a bad value can't crash
+        # the import; empty counts as unset
+        raw_ttl = env.get("AI_REVIEW_CACHE_TTL", "").strip()
+        try:
+            cls.REVIEW_CACHE_TTL = int(raw_ttl) if raw_ttl else 604800
+            cls._INVALID_CACHE_TTL = None
+        except ValueError:
+            cls.REVIEW_CACHE_TTL = 604800
+            cls._INVALID_CACHE_TTL = raw_ttl
 
     @classmethod
     def validate(cls) -> list[str]:
@@ -72,20 +160,30 @@ class Config:
         if cls.REVIEW_LANGUAGE not in ['vietnamese', 'english']:
             errors.append(f"Invalid REVIEW_LANGUAGE: {cls.REVIEW_LANGUAGE}. Must be 'vietnamese' or 'english'")
 
+        if cls._INVALID_CACHE_TTL is not None:
+            errors.append(f"Invalid AI_REVIEW_CACHE_TTL: {cls._INVALID_CACHE_TTL!r}. Must be a number of seconds")
+
         return errors
 
     @classmethod
     def print_debug_info(cls):
         """Print configuration for debugging (with masked secrets)."""
-        print("=" * 60)
-        print("🔍 Environment Variables Check:")
-        print("=" * 60)
-        print(f"   GITHUB_REF:           {cls.GITHUB_REF or '❌ NOT SET'}")
-        print(f"   GITHUB_REPOSITORY:    {cls.GITHUB_REPOSITORY or '❌ NOT SET'}")
-        print(f"   GITHUB_TOKEN:         {'✅ SET (' + cls.GITHUB_TOKEN[:8] + '...)' if cls.GITHUB_TOKEN else '❌ NOT SET'}")
-        print(f"   OPENROUTER_API_KEY:   {'✅ SET' if cls.OPENROUTER_API_KEY else '❌ NOT SET'}")
-        print(f"   OPENROUTER_MODEL:     {cls.OPENROUTER_MODEL} (configured in code)")
-        print(f"   REVIEW_LANGUAGE:      {cls.REVIEW_LANGUAGE}")
-        print(f"   ENABLE_REASONING:     {cls.ENABLE_REASONING} (configured in code)")
-        print("=" * 60)
-        print()
+        # Single write: one stdout flush instead of one per line under CI
+        print("\n".join([
+            "=" * 60,
+            "🔍 Environment Variables Check:",
+            "=" * 60,
+            f"   GITHUB_REF:           {cls.GITHUB_REF or '❌ NOT SET'}",
+            f"   GITHUB_REPOSITORY:    {cls.GITHUB_REPOSITORY or '❌ NOT SET'}",
+            f"   GITHUB_PR_NUMBERS:    {cls.GITHUB_PR_NUMBERS or '(not set, using GITHUB_REF)'}",
+            f"   GITHUB_TOKEN:         {'✅ SET' if cls.GITHUB_TOKEN else '❌ NOT SET'}",
+            f"   OPENROUTER_API_KEY:   {'✅ SET' if cls.OPENROUTER_API_KEY else '❌ NOT SET'}",
+            f"   OPENROUTER_MODEL:     {cls.OPENROUTER_MODEL} (configured in code)",
+            f"   REVIEW_LANGUAGE:      {cls.REVIEW_LANGUAGE}",
+            f"   ENABLE_REASONING:     {cls.ENABLE_REASONING} (configured in code)",
+            "=" * 60,
+            "",
+        ]))
+
+
+Config.load_env()
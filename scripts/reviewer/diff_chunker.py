@@ -6,12 +6,172 @@ Handles intelligent splitting of PR diffs to avoid:
 - Output truncation issues
 """
 
-from typing import List, Dict, Tuple
+import bisect
+import re
+from typing import List, Tuple
+
+from .config import Config
+
+# 'diff --git a/<old> b/<new>' file header; group 1 holds both paths, see
+# _header_path()
+_DIFF_HEADER_RE = re.compile(r'^diff --git (.*)$', re.MULTILINE)
+
+# New path in the header: git quotes paths with non-ASCII or special
+# characters ("b/caf\303\251.dart"), other paths are taken as they are
+_QUOTED_NEW_PATH_RE = re.compile(r'"b/((?:[^"\\]|\\.)*)"$')
+_NEW_PATH_RE = re.compile(r'a/.+? b/(.+)$')
+
+# C-style escapes git uses in quoted paths; octal escapes are UTF-8 bytes
+_PATH_ESCAPE_RE = re.compile(r'\\(?:([0-7]{1,3})|(.))')
+_PATH_ESCAPES = {'a': '\a', 'b': '\b', 't': '\t', 'n': '\n', 'v': '\v', 'f': '\f', 'r': '\r'}
+
+
+def _glob_regex(pattern: str) -> str:
+    """Translate a Config.GENERATED_FILE_PATTERNS glob into a regex.
+
+    '*' and '?' stop at '/'. Patterns without '/' match the file name in any
+    directory; others match the path from the repository root.
+
+    Args:
+        pattern: Glob pattern
+
+    Returns:
+        Regex source matching a full path
+    """
+    regex = ''.join(
+        '[^/]*' if char == '*' else '[^/]' if char == '?' else re.escape(char)
+        for char in pattern
+    )
+    return regex if '/' in pattern else '(?:.*/)?' + regex
+
+
+# Any generated/lock file, matched against the full path
+_GENERATED_FILE_RE = re.compile(
+    '(?:' + '|'.join(_glob_regex(pattern) for pattern in Config.GENERATED_FILE_PATTERNS) + r')\Z'
+)
+
+# Start of a hunk ("@@ -a,b +c,d @@") inside a file diff
+_HUNK_HEADER_RE = re.compile(r'^@@ ', re.MULTILINE)
+
+# Files where whitespace outside string literals carries no meaning, so a
+# whitespace-only change needs no review (not YAML, Makefiles or ARB)
+_WHITESPACE_INSENSITIVE_SUFFIXES = ('.dart',)
+
+# Extended header lines of a file diff that change the file itself
+_FILE_LEVEL_CHANGES = (
+    'rename from ', 'copy from ', 'old mode ', 'new file mode ', 'deleted file mode ',
+    'Binary files ',
+)
+
+# A Dart token: a single-line string literal (whitespace inside is content),
+# a comment delimiter, a run of other non-space characters, or a lone quote
+# that opens a string the line does not close (multi-line strings)
+_DART_TOKEN_RE = re.compile(
+    r"""'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|//|/\*|\*/|[^\s'"/*]+|[/*'"]"""
+)
+
+# Token marking the end of a '//' comment (the line break ending it)
+_LINE_COMMENT_END = '\n'
+
+
+def _dart_tokens(lines: List[str]) -> List[str]:
+    """Split Dart lines into tokens, ignoring whitespace between them.
+
+    The text of a '//' comment is split on whitespace and followed by
+    _LINE_COMMENT_END, so joining code onto a comment line (commenting it
+    out) or moving it off one changes the tokens.
+
+    Args:
+        lines: Source lines
+
+    Returns:
+        Tokens in order
+    """
+    tokens = []
+    for line in lines:
+        for match in _DART_TOKEN_RE.finditer(line):
+            token = match.group()
+            if token == '//':
+                tokens.append(token)
+                tokens += line[match.end():].split()
+                tokens.append(_LINE_COMMENT_END)
+                break
+            tokens.append(token)
+    return tokens
+
+
+def _same_dart_tokens(removed: List[str], added: List[str]) -> bool:
+    """Check whether two blocks of Dart lines differ only in whitespace.
+
+    Args:
+        removed: Removed lines (without the '-' marker)
+        added: Added lines (without the '+' marker)
+
+    Returns:
+        True if both blocks have the same tokens and neither touches a
+        string literal spanning several lines
+    """
+    removed_tokens = _dart_tokens(removed)
+    if removed_tokens != _dart_tokens(added):
+        return False
+    # Spacing inside a multi-line string can't be told apart from indentation
+    return not any(token in ("'", '"') for token in removed_tokens)
+
+
+def _header_path(paths: str) -> str:
+    """Get the new file path from the part of a header after 'diff --git '.
+
+    Args:
+        paths: '<old> <new>' in git's quoted or unquoted form
+
+    Returns:
+        New file path without the 'b/' prefix ("unknown" if unparsable)
+    """
+    match = _QUOTED_NEW_PATH_RE.search(paths)
+    if match:
+        raw = bytearray()
+        pos = 0
+        quoted = match.group(1)
+        for escape in _PATH_ESCAPE_RE.finditer(quoted):
+            raw += quoted[pos:escape.start()].encode('utf-8')
+            octal, char = escape.groups()
+            if octal:
+                raw.append(int(octal, 8) & 0xFF)
+            else:
+                raw += _PATH_ESCAPES.get(char, char).encode('utf-8')  # \" and \\ keep the char
+            pos = escape.end()
+        raw += quoted[pos:].encode('utf-8')
+        return raw.decode('utf-8', errors='replace')
+
+    match = _NEW_PATH_RE.match(paths)
+    return match.group(1) if match else "unknown"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text.
+
+    There is no tokenizer for the OpenRouter model available locally, so this
+    uses ~4 UTF-8 bytes per token. Counting bytes instead of characters makes
+    Vietnamese and emoji-heavy text (2-4 bytes per char) weigh more, matching
+    how tokenizers treat them.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate token count
+    """
+    return len(text.encode('utf-8')) // 4
 
 
 class DiffChunk:
     """Represents a chunk of diff to be reviewed."""
 
+    __slots__ = ('content', 'files', 'chunk_index', 'total_chunks')
+
+    # Header label per review language
+    _HEADER_LABELS = {"english": "Chunk", "vietnamese": "Phần"}
+
     def __init__(self, content: str, files: List[str], chunk_index: int, total_chunks: int):
         """Initialize a diff chunk.
 
@@ -38,10 +198,8 @@ class DiffChunk:
         if self.total_chunks == 1:
             return ""
 
-        if language == "english":
-            return f"**Chunk {self.chunk_index + 1}/{self.total_chunks}** - Files: {', '.join(self.files)}\n\n"
-        else:  # Vietnamese
-            return f"**Phần {self.chunk_index + 1}/{self.total_chunks}** - Files: {', '.join(self.files)}\n\n"
+        label = self._HEADER_LABELS.get(language, "Phần")  # Default: Vietnamese
+        return f"**{label} {self.chunk_index + 1}/{self.total_chunks}** - Files: {', '.join(self.files)}\n\n"
 
 
 class DiffChunker:
@@ -51,6 +209,8 @@ class DiffChunker:
     SINGLE_PASS_FILE_THRESHOLD = 5  # If <= 5 files, use single-pass review
     SINGLE_PASS_CHAR_THRESHOLD = 30000  # If <= 30k chars, use single-pass
     MAX_CHUNK_SIZE = 40000  # Max chars per chunk (conservative to avoid attention issues)
+    SINGLE_PASS_TOKEN_THRESHOLD = 20000  # Chunk even few-file PRs above ~20k diff tokens
+    MAX_CHUNK_TOKENS = 12000  # Max estimated tokens per chunk
 
     def __init__(self):
         """Initialize diff chunker."""
@@ -65,11 +225,24 @@ class DiffChunker:
         Returns:
             True if should use chunking, False for single-pass
         """
-        # Parse files from diff
-        files = self._extract_file_boundaries(diff_text)
+        return self._should_chunk(diff_text, len(_DIFF_HEADER_RE.findall(diff_text)))
+
+    def _should_chunk(self, diff_text: str, file_count: int) -> bool:
+        """Apply the chunking thresholds to an already parsed diff.
+
+        Args:
+            diff_text: Full PR diff
+            file_count: Number of files in the diff
+
+        Returns:
+            True if should use chunking, False for single-pass
+        """
+        # A few very large files can still overflow the model context
+        if estimate_tokens(diff_text) > self.SINGLE_PASS_TOKEN_THRESHOLD:
+            return True
 
         # Small PRs: single-pass review
-        if len(files) <= self.SINGLE_PASS_FILE_THRESHOLD:
+        if file_count <= self.SINGLE_PASS_FILE_THRESHOLD:
             return False
 
         # Short diffs: single-pass review
@@ -79,6 +252,125 @@ class DiffChunker:
         # Large PRs: use chunking
         return True
 
+    def get_file_paths(self, diff_text: str) -> List[str]:
+        """List the paths of all files changed in a diff.
+
+        Args:
+            diff_text: Full PR diff
+
+        Returns:
+            File paths in diff order
+        """
+        return [_header_path(paths) for paths in _DIFF_HEADER_RE.findall(diff_text)]
+
+    def get_hunk_starts(self, file_diff: str) -> List[int]:
+        """List the offsets of the hunk headers in a file's diff.
+
+        Args:
+            file_diff: Diff of a single file (starting at its 'diff --git' line)
+
+        Returns:
+            Offset of each '@@ ' line, in order
+        """
+        return [match.start() for match in _HUNK_HEADER_RE.finditer(file_diff)]
+
+    def is_generated_only(self, diff_text: str) -> bool:
+        """Check whether a diff only touches generated or lock files.
+
+        Such PRs (e.g. build_runner or pub get regenerations) have nothing
+        worth an AI review, see Config.GENERATED_FILE_PATTERNS.
+
+        Args:
+            diff_text: Full PR diff
+
+        Returns:
+            True if every changed file is generated
+        """
+        file_paths = self.get_file_paths(diff_text)
+        return bool(file_paths) and all(
+            _GENERATED_FILE_RE.match(path) for path in file_paths
+        )
+
+    def strip_generated_files(self, diff_text: str) -> Tuple[str, List[str]]:
+        """Remove generated/lock files from a diff.
+
+        Their diffs are often huge (pubspec.lock, *.g.dart) and there is
+        nothing in them for the AI to review, see Config.GENERATED_FILE_PATTERNS.
+
+        Args:
+            diff_text: Full PR diff
+
+        Returns:
+            Tuple of (diff without generated files, omitted file paths)
+        """
+        files = self._extract_file_boundaries(diff_text)
+        kept = []
+        omitted = []
+        for i, (start_pos, file_path) in enumerate(files):
+            if _GENERATED_FILE_RE.match(file_path):
+                omitted.append(file_path)
+            else:
+                end_pos = files[i + 1][0] if i + 1 < len(files) else len(diff_text)
+                kept.append(diff_text[start_pos:end_pos])
+
+        if not omitted:
+            return diff_text, []
+        return diff_text[:files[0][0]] + ''.join(kept), omitted
+
+    def is_whitespace_only(self, diff_text: str) -> bool:
+        """Check whether a diff only changes whitespace and line breaks.
+
+        Each block of removed/added lines is compared as a sequence of Dart
+        tokens, so re-indented or reflowed code (e.g. after dart format)
+        matches while any token change, including moving lines around or
+        touching the spacing inside a string literal, does not. Only .dart
+        files qualify: in YAML, Makefiles or ARB files whitespace is content.
+        Files without hunks (renames, mode changes, empty files) never do.
+
+        Args:
+            diff_text: Full PR diff
+
+        Returns:
+            True if no change in the diff alters a token
+        """
+        removed, added = [], []
+        in_hunk = False
+        file_path = None
+        has_hunk = False
+        for line in diff_text.split('\n'):
+            marker = line[:1]
+            if in_hunk and marker == '-':
+                removed.append(line[1:])
+                continue
+            if in_hunk and marker == '+':
+                added.append(line[1:])
+                continue
+            if in_hunk and marker == '\\':  # "\ No newline at end of file"
+                continue
+
+            # Any other line ends the current block of changes
+            if (removed or added) and not _same_dart_tokens(removed, added):
+                return False
+            removed, added = [], []
+
+            if line.startswith('diff --git '):
+                if file_path is not None and not has_hunk:
+                    return False
+                file_path = _header_path(line[len('diff --git '):])
+                if not file_path.endswith(_WHITESPACE_INSENSITIVE_SUFFIXES):
+                    return False
+                has_hunk = False
+                in_hunk = False
+            elif marker == '@':
+                in_hunk = True
+                has_hunk = True
+            elif not in_hunk and line.startswith(_FILE_LEVEL_CHANGES):
+                return False
+
+        if (removed or added) and not _same_dart_tokens(removed, added):
+            return False
+        return file_path is not None and has_hunk
+
     def chunk_diff(self, diff_text: str) -> List[DiffChunk]:
         """Split diff into chunks by file boundaries.
 
@@ -86,8 +378,10 @@ class DiffChunker:
             diff_text: Full PR diff
 
         Returns:
-            List of DiffChunk objects
+            List of DiffChunk objects (a single chunk with the whole diff
+            if it is small enough for a single-pass review)
         """
+        # Parse file boundaries once; reused for the threshold check below
         files = self._extract_file_boundaries(diff_text)
 
         # No files found - return as single chunk
@@ -95,87 +389,134 @@ class DiffChunker:
             return [DiffChunk(diff_text, ["unknown"], 0, 1)]
 
         # Single-pass if small enough
-        if not self.should_chunk(diff_text):
-            file_paths = [f['file_path'] for f in files]
+        if not self._should_chunk(diff_text, len(files)):
+            file_paths = [file_path for _, file_path in files]
             return [DiffChunk(diff_text, file_paths, 0, 1)]
 
-        # Chunk by files
-        chunks = []
-        current_chunk_content = ""
-        current_chunk_files = []
-        chunk_index = 0
-
-        for i, file_info in enumerate(files):
+        # Cut the diff into per-file pieces (oversized files split by hunk)
+        pieces = []
+        for i, (start_pos, file_path) in enumerate(files):
             # Extract this file's diff
-            start_pos = file_info['position']
             if i + 1 < len(files):
-                end_pos = files[i + 1]['position']
+                end_pos = files[i + 1][0]
             else:
                 end_pos = len(diff_text)
 
             file_diff = diff_text[start_pos:end_pos]
+            for piece in self._split_oversized_file(file_diff):
+                pieces.append((file_path, piece))
+
+        groups = self._pack_pieces(pieces)
 
-            # Check if adding this file exceeds chunk size
-            if current_chunk_content and len(current_chunk_content) + len(file_diff) > self.MAX_CHUNK_SIZE:
-                # Save current chunk
-                chunks.append(DiffChunk(
-                    current_chunk_content,
-                    current_chunk_files,
-                    chunk_index,
-                    0  # Will update total_chunks later
-                ))
-                chunk_index += 1
-                current_chunk_content = ""
-                current_chunk_files = []
-
-            # Add file to current chunk
-            current_chunk_content += file_diff
-            current_chunk_files.append(file_info['file_path'])
-
-        # Add last chunk
-        if current_chunk_content:
-            chunks.append(DiffChunk(
-                current_chunk_content,
-                current_chunk_files,
-                chunk_index,
-                0
-            ))
-
-        # Update total_chunks for all chunks
-        total_chunks = len(chunks)
-        for chunk in chunks:
-            chunk.total_chunks = total_chunks
-
-        return chunks
-
-    def _extract_file_boundaries(self, diff_text: str) -> List[Dict]:
+        total_chunks = len(groups)
+        return [
+            DiffChunk(content, chunk_files, chunk_index, total_chunks)
+            for chunk_index, (content, chunk_files) in enumerate(groups)
+        ]
+
+    def _pack_pieces(self, pieces: List[Tuple[str, str]]) -> List[Tuple[str, List[str]]]:
+        """Pack file pieces into as few, evenly filled chunks as possible.
+
+        Best-fit decreasing: pieces are placed largest first into the open
+        chunk with the least free space that still fits them (found by
+        bisecting the free-space list). Balanced chunks matter because chunks
+        are reviewed in parallel and the largest one sets the total latency.
+        Each chunk keeps its pieces in diff order, and chunks are ordered by
+        their first piece.
+
+        Args:
+            pieces: (file_path, diff_piece) tuples in diff order
+
+        Returns:
+            List of (content, file_paths) per chunk
+        """
+        sizes = [len(piece) for _, piece in pieces]
+        tokens = [estimate_tokens(piece) for _, piece in pieces]
+
+        # Open chunks sorted by free characters: parallel lists of the free
+        # space (bisect key) and [free_chars, free_tokens, piece_indexes]
+        free_chars = []
+        open_chunks = []
+
+        for idx in sorted(range(len(pieces)), key=lambda k: -sizes[k]):
+            pos = bisect.bisect_left(free_chars, sizes[idx])
+            while pos < len(open_chunks) and open_chunks[pos][1] < tokens[idx]:
+                pos += 1
+
+            if pos < len(open_chunks):
+                free_chars.pop(pos)
+                chunk = open_chunks.pop(pos)
+            else:
+                # Nothing fits: open a new chunk (an oversized piece goes alone)
+                chunk = [self.MAX_CHUNK_SIZE, self.MAX_CHUNK_TOKENS, []]
+
+            chunk[0] -= sizes[idx]
+            chunk[1] -= tokens[idx]
+            chunk[2].append(idx)
+
+            pos = bisect.bisect_left(free_chars, chunk[0])
+            free_chars.insert(pos, chunk[0])
+            open_chunks.insert(pos, chunk)
+
+        groups = []
+        for piece_indexes in sorted(sorted(chunk[2]) for chunk in open_chunks):
+            chunk_files = []
+            for idx in piece_indexes:
+                if pieces[idx][0] not in chunk_files:
+                    chunk_files.append(pieces[idx][0])
+            content = "".join(pieces[idx][1] for idx in piece_indexes)
+            groups.append((content, chunk_files))
+
+        return groups
+
+    def _split_oversized_file(self, file_diff: str) -> List[str]:
+        """Split a single file diff that exceeds the chunk limits at hunk boundaries.
+
+        Each piece repeats the file header so the model still knows which file
+        the hunks belong to. A single hunk larger than the limits stays whole.
+
+        Args:
+            file_diff: Diff of a single file (starting at its 'diff --git' line)
+
+        Returns:
+            List of file diff pieces (just [file_diff] if it fits)
+        """
+        if (len(file_diff) <= self.MAX_CHUNK_SIZE
+                and estimate_tokens(file_diff) <= self.MAX_CHUNK_TOKENS):
+            return [file_diff]
+
+        hunk_starts = self.get_hunk_starts(file_diff)
+        if len(hunk_starts) < 2:
+            return [file_diff]
+
+        file_header = file_diff[:hunk_starts[0]]
+        hunk_ends = hunk_starts[1:] + [len(file_diff)]
+
+        pieces = []
+        current_start = hunk_starts[0]
+        for hunk_start, hunk_end in zip(hunk_starts, hunk_ends):
+            candidate = file_header + file_diff[current_start:hunk_end]
+            if hunk_start > current_start and (
+                len(candidate) > self.MAX_CHUNK_SIZE
+                or estimate_tokens(candidate) > self.MAX_CHUNK_TOKENS
+            ):
+                pieces.append(file_header + file_diff[current_start:hunk_start])
+                current_start = hunk_start
+        pieces.append(file_header + file_diff[current_start:])
+
+        return pieces
+
+    def _extract_file_boundaries(self, diff_text: str) -> List[Tuple[int, str]]:
         """Extract file boundaries from diff.
 
         Args:
             diff_text: The diff text
 
         Returns:
-            List of dicts with file info: {'position': int, 'file_path': str}
+            List of (position, file_path) tuples, one per file header
         """
-        files = []
-        lines = diff_text.split('\n')
-        current_pos = 0
-
-        for i, line in enumerate(lines):
-            if line.startswith('diff --git '):
-                # Extract file path (b/path/to/file.dart)
-                parts = line.split(' ')
-                file_path = parts[3] if len(parts) >= 4 else "unknown"
-                # Remove 'b/' prefix
-                if file_path.startswith('b/'):
-                    file_path = file_path[2:]
-
-                files.append({
-                    'position': current_pos,
-                    'line_num': i,
-                    'file_path': file_path
-                })
-
-            current_pos += len(line) + 1  # +1 for newline
-
-        return files
+        # One regex pass in C instead of splitting the whole diff into lines
+        return [
+            (match.start(), _header_path(match.group(1)))
+            for match in _DIFF_HEADER_RE.finditer(diff_text)
+        ]
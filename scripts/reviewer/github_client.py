@@ -1,15 +1,25 @@
 """GitHub API client for fetching PR information and posting comments.
 
 Handles all interactions with GitHub API including:
-- Fetching PR metadata
 - Downloading PR diffs
 - Posting review comments (with chunking for long reviews)
 """
 
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests  # pyright: ignore[reportMissingModuleSource]
+from requests.adapters import HTTPAdapter  # pyright: ignore[reportMissingModuleSource]
 
 from .config import Config
+from .rate_limit import TokenBucket
+from .utils import json_dumps, json_loads
+
+
+# Lines where a long review may be split (headings, emoji sections), after
+# optional leading whitespace
+_BOUNDARY_RE = re.compile(r'\s*(?:##|###|🔴|⚠️|💡|✅|---)')
 
 
 class GitHubAPIError(Exception):
@@ -20,6 +30,9 @@ class GitHubAPIError(Exception):
 class GitHubClient:
     """Client for interacting with GitHub API."""
 
+    # Comment creation is what GitHub's secondary rate limits target
+    _comment_bucket = TokenBucket(Config.GITHUB_COMMENTS_PER_MINUTE, Config.GITHUB_COMMENT_BURST)
+
     def __init__(self, repo: str, token: str):
         """Initialize GitHub client.
 
@@ -31,6 +44,24 @@ class GitHubClient:
         self.token = token
         self.base_url = f"https://api.github.com/repos/{repo}"
 
+        # Shared session keeps the TCP+TLS connection to api.github.com alive
+        # across the diff and comment requests (and PRs in batch mode)
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"token {token}"})
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        )
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def fetch_pr_diff(self, pr_number: str) -> str:
         """Fetch the diff for a pull request.
 
@@ -44,19 +75,15 @@ class GitHubClient:
             GitHubAPIError: If fetching fails
         """
         pr_url = f"{self.base_url}/pulls/{pr_number}"
-        print(f"   Fetching PR metadata from: {pr_url}")
-
-        # First, get PR metadata with JSON
-        headers_json = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        print(f"   Fetching diff via GitHub API: {pr_url}")
 
+        # The diff request alone is enough: GitHub answers it with the same
+        # 404/401 statuses as the JSON endpoint, so no metadata pre-check
         try:
-            response = requests.get(pr_url, headers=headers_json, timeout=30)
-            response.raise_for_status()
+            diff_text = self._download_diff(pr_url, Config.MAX_DIFF_BYTES)
         except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
+            status_code = e.response.status_code
+            if status_code == 404:
                 raise GitHubAPIError(
                     f"PR #{pr_number} not found in {self.repo}.\n"
                     f"   API URL: {pr_url}\n"
@@ -65,51 +92,24 @@ class GitHubClient:
                     f"   - GITHUB_TOKEN has correct permissions\n"
                     f"   - Repository name is correct: {self.repo}"
                 )
-            elif response.status_code == 401:
+            elif status_code == 401:
                 raise GitHubAPIError(
                     "Authentication failed. GITHUB_TOKEN may be invalid or expired."
                 )
             else:
-                raise GitHubAPIError(f"GitHub API error ({response.status_code}): {e}")
-
-        pr_data = response.json()
-
-        # Validate response is a dict
-        if not isinstance(pr_data, dict):
-            raise GitHubAPIError(
-                f"Unexpected PR data format: expected dict, got {type(pr_data).__name__}. "
-                f"Response: {pr_data}"
-            )
-
-        pr_state = pr_data.get("state", "unknown")
-        pr_title = pr_data.get("title", "N/A")
-
-        print(f"   ✅ PR found: '{pr_title}'")
-        print(f"   State: {pr_state}")
-
-        # Fetch diff via GitHub API (more reliable for private repos)
-        print(f"   Fetching diff via GitHub API...")
-        headers_diff = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3.diff"
-        }
-
-        try:
-            diff_response = requests.get(pr_url, headers=headers_diff, timeout=30)
-            diff_response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            raise GitHubAPIError(
-                f"Failed to fetch diff via API\n"
-                f"   Status code: {diff_response.status_code}\n"
-                f"   Error: {e}\n"
-                f"   This may happen if:\n"
-                f"   - GITHUB_TOKEN lacks 'repo' scope for private repos\n"
-                f"   - The PR has no changes\n"
-                f"   - API rate limit exceeded"
-            )
+                raise GitHubAPIError(
+                    f"Failed to fetch diff via API\n"
+                    f"   Status code: {status_code}\n"
+                    f"   Error: {e}\n"
+                    f"   This may happen if:\n"
+                    f"   - GITHUB_TOKEN lacks 'repo' scope for private repos\n"
+                    f"   - The PR has no changes\n"
+                    f"   - API rate limit exceeded"
+                )
+        except requests.exceptions.RequestException as e:
+            raise GitHubAPIError(f"Failed to fetch diff via API: {e}")
 
-        diff_text = diff_response.text
-        if not diff_text or len(diff_text.strip()) == 0:
+        if not diff_text or diff_text.isspace():  # isspace(): no stripped copy
             raise GitHubAPIError(
                 "PR diff is empty. The PR may have no code changes."
             )
@@ -123,6 +123,44 @@ class GitHubClient:
         print(f"   ✅ Diff fetched successfully ({len(diff_text)} characters)")
         return diff_text
 
+    def _download_diff(self, pr_url: str, max_bytes: int) -> str:
+        """Download the PR diff as a gzip-compressed stream.
+
+        The body is accumulated as raw bytes and decoded once at the end.
+        Reading stops at max_bytes so huge diffs don't pull megabytes that
+        would never fit into a review anyway.
+
+        Args:
+            pr_url: Pull request API URL
+            max_bytes: Maximum number of diff bytes to keep
+
+        Returns:
+            The diff text (cut at the last complete line if capped)
+
+        Raises:
+            requests.exceptions.HTTPError: If GitHub returns an error status
+        """
+        headers = {"Accept": "application/vnd.github.v3.diff", "Accept-Encoding": "gzip"}
+        response = self.session.get(pr_url, headers=headers, timeout=30, stream=True)
+        buf = bytearray()
+        capped = False
+        try:
+            response.raise_for_status()
+            for block in response.iter_content(chunk_size=65536):
+                buf += block
+                if len(buf) > max_bytes:
+                    capped = True
+                    break
+        finally:
+            response.close()
+
+        if capped:
+            del buf[buf.rfind(b"\n", 0, max_bytes) + 1:]
+            print(f"   ⚠️  Diff exceeds {max_bytes} bytes, "
+                  f"ignoring the remainder")
+
+        return buf.decode("utf-8", errors="replace")
+
     def post_comment(self, pr_number: str, body: str) -> dict:
         """Post a single comment to a PR.
 
@@ -138,18 +176,19 @@ class GitHubClient:
         """
         comments_url = f"{self.base_url}/issues/{pr_number}/comments"
         headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Accept": "application/vnd.github.v3+json",
+            "Content-Type": "application/json"
         }
-        payload = {"body": body}
+        payload = json_dumps({"body": body})
 
+        self._comment_bucket.acquire()
         try:
-            response = requests.post(
-                comments_url, headers=headers, json=payload, timeout=30
+            response = self.session.post(
+                comments_url, headers=headers, data=payload, timeout=30
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
+            return json_loads(response.content)
+        except requests.exceptions.RequestException as e:
             raise GitHubAPIError(f"Failed to post comment: {e}")
 
     def post_review_chunked(self, pr_number: str, review_text: str):
@@ -161,13 +200,17 @@ class GitHubClient:
         Args:
             pr_number: Pull request number
             review_text: Review text to post
+
+        Raises:
+            GitHubAPIError: If any comment could not be posted
         """
         header = Config.COMMENT_HEADER
+        header_len = len(header)
         max_length = Config.MAX_COMMENT_LENGTH
 
         # If review fits in one comment, post it directly
-        if len(review_text) <= max_length - len(header):
-            full_comment = header + review_text
+        if len(review_text) <= max_length - header_len:
+            full_comment = f"{header}{review_text}"
             self.post_comment(pr_number, full_comment)
             print(f"   ✅ Posted 1 comment ({len(full_comment)} characters)")
             return
@@ -178,21 +221,45 @@ class GitHubClient:
             f"splitting into multiple comments..."
         )
 
-        chunks = self._split_review_into_chunks(review_text, max_length - len(header) - 500)
+        chunks = self._split_review_into_chunks(review_text, max_length - header_len - 500)
+        total = len(chunks)
 
-        # Post chunks
-        for i, chunk in enumerate(chunks, 1):
-            part_header = header
-            if len(chunks) > 1:
-                part_header += f"**Part {i}/{len(chunks)}**\n\n"
+        if total == 1:
+            # Nothing left to split (e.g. trailing whitespace); post without part numbering
+            full_comment = f"{header}{chunks[0]}"
+            self.post_comment(pr_number, full_comment)
+            print(f"   ✅ Posted 1 comment ({len(full_comment)} characters)")
+            return
 
-            comment_body = part_header + chunk
+        # Post parts concurrently; each body carries "Part i/N" so readers can
+        # follow the order even if GitHub records them slightly out of order.
+        # Starts are staggered so the parts usually get created in order.
+        def post_part(i: int, chunk: str):
+            comment_body = f"{header}**Part {i}/{total}**\n\n{chunk}"
             self.post_comment(pr_number, comment_body)
-            print(f"   ✅ Posted part {i}/{len(chunks)} ({len(comment_body)} characters)")
-
-            # Small delay between comments to avoid rate limiting
-            if i < len(chunks):
-                time.sleep(1)
+            # One write per line so lines from concurrent posts don't interleave
+            print(f"   ✅ Posted part {i}/{total} ({len(comment_body)} characters)\n", end="")
+
+        with ThreadPoolExecutor(max_workers=Config.MAX_PARALLEL_COMMENT_POSTS) as executor:
+            futures = []
+            for i, chunk in enumerate(chunks, 1):
+                if i > 1:
+                    time.sleep(Config.COMMENT_POST_STAGGER)
+                futures.append(executor.submit(post_part, i, chunk))
+
+        # Wait for every part (in order) so one failure doesn't hide the others
+        failed_parts = []
+        for i, future in enumerate(futures, 1):
+            try:
+                future.result()
+            except GitHubAPIError as e:
+                failed_parts.append(f"part {i}/{total}: {e}")
+
+        if failed_parts:
+            raise GitHubAPIError(
+                f"Failed to post {len(failed_parts)} of {total} review parts:\n   "
+                + "\n   ".join(failed_parts)
+            )
 
     def _split_review_into_chunks(self, text: str, safe_limit: int) -> list[str]:
         """Split review text into chunks at logical boundaries.
@@ -207,32 +274,41 @@ class GitHubClient:
             List of text chunks
         """
         chunks = []
-        current_chunk = ""
-
-        # Split boundary markers (headings, emoji sections)
-        boundary_markers = ('##', '###', '🔴', '⚠️', '💡', '✅', '---')
-
-        for line in text.split('\n'):
-            test_chunk = current_chunk + line + '\n'
-
-            if len(current_chunk) > safe_limit:
-                # Current chunk is already too big, must split now
-                if line.strip().startswith(boundary_markers):
-                    # Good place to split - save current chunk
-                    if current_chunk.strip():
-                        chunks.append(current_chunk.strip())
-                    current_chunk = line + '\n'
-                elif current_chunk.strip():
-                    # Force split even if not ideal boundary
-                    chunks.append(current_chunk.strip())
-                    current_chunk = line + '\n'
+        chunk_start = 0  # Offset where the current chunk begins
+        text_len = len(text)
+
+        while True:
+            # Jump straight to the first line starting more than safe_limit
+            # chars into the chunk; lines before it never trigger a split
+            newline = text.find('\n', chunk_start + safe_limit)
+            if newline == -1:
+                break
+            line_start = newline + 1
+
+            # Over the limit: split at this line, or drop lines until one fits
+            while line_start <= text_len:
+                line_end = text.find('\n', line_start)
+                if line_end == -1:
+                    line_end = text_len
+
+                current_chunk = text[chunk_start:line_start].strip()
+                # Boundary match runs on the line in place, without slicing it
+                if current_chunk or _BOUNDARY_RE.match(text, line_start, line_end):
+                    # Split here (a heading/emoji boundary, or forced)
+                    if current_chunk:
+                        chunks.append(current_chunk)
+                    chunk_start = line_start
+                    break
+
+                # Whitespace-only chunk: drop this line
+                chunk_start = line_start = line_end + 1
             else:
-                # Still within limit, keep adding
-                current_chunk = test_chunk
+                break
 
         # Add last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        current_chunk = text[chunk_start:].strip()
+        if current_chunk:
+            chunks.append(current_chunk)
 
         return chunks
 
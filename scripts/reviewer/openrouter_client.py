@@ -9,11 +9,17 @@ Handles all interactions with OpenRouter API including:
 
 from __future__ import annotations
 
+import random
+import threading
 import time
-import json
+from email.utils import parsedate_to_datetime
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import Config
+from .rate_limit import TokenBucket
+from .utils import json_dumps, json_loads
 
 
 class OpenRouterAPIError(Exception):
@@ -21,9 +27,97 @@ class OpenRouterAPIError(Exception):
     pass
 
 
+class OpenRouterRateLimitError(OpenRouterAPIError):
+    """Rate limit (429) still exceeded after retrying."""
+    pass
+
+
+class OpenRouterUnavailableError(OpenRouterAPIError):
+    """Model temporarily unavailable (timeout, network error, 5xx)."""
+    pass
+
+
+class OpenRouterAuthError(OpenRouterAPIError):
+    """API key rejected (401) or lacking permissions (403)."""
+    pass
+
+
+class OpenRouterCreditsError(OpenRouterAPIError):
+    """Account has insufficient credits (402)."""
+    pass
+
+
+# Error class per HTTP status / error code reported by OpenRouter
+_ERRORS_BY_STATUS = {
+    401: OpenRouterAuthError,
+    402: OpenRouterCreditsError,
+    403: OpenRouterAuthError,
+    429: OpenRouterRateLimitError,
+    502: OpenRouterUnavailableError,
+    503: OpenRouterUnavailableError,
+}
+
+
+def _jitter(delay: float) -> float:
+    """Randomize a backoff delay within [delay/2, delay].
+
+    Concurrent CI runs that hit the same rate limit would otherwise retry in
+    lockstep and collide again.
+    """
+    return random.uniform(delay / 2, delay)
+
+
+class _CircuitBreaker:
+    """Consecutive-failure circuit breaker for one model.
+
+    CLOSED: requests pass. After Config.CIRCUIT_BREAKER_FAILURES failures in a
+    row it turns OPEN and rejects requests for Config.CIRCUIT_BREAKER_COOLDOWN
+    seconds, then lets a single probe through (HALF-OPEN); the probe's
+    outcome closes or re-opens it. Shared by the threads reviewing chunks/PRs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None  # monotonic time, None while CLOSED
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Check whether a request to the model may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < Config.CIRCUIT_BREAKER_COOLDOWN:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        """Close the breaker after a successful request."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """Count a failed request, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= Config.CIRCUIT_BREAKER_FAILURES:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
 class OpenRouterClient:
     """Client for interacting with OpenRouter API."""
 
+    # Request pacing shared by all clients (one client per PR)
+    _bucket = TokenBucket(Config.OPENROUTER_REQUESTS_PER_MINUTE, Config.OPENROUTER_BURST)
+
+    # Breakers per model name, shared by all clients
+    _breakers: dict[str, _CircuitBreaker] = {}
+    _breakers_lock = threading.Lock()
+
     def __init__(self, api_key: str, project_name: str = "AI Code Review Bot", pr_number: int | None = None):
         """Initialize OpenRouter client.
 
@@ -46,20 +140,38 @@ class OpenRouterClient:
         if pr_number:
             x_title = f"{project_name} - PR #{pr_number}"
 
-        self.headers = {
+        # Session keeps the connection to openrouter.ai alive across chunks
+        # and retries; one pooled connection per concurrent LLM call
+        self.session = requests.Session()
+        self.session.headers.update({
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "X-Title": x_title,
             "HTTP-Referer": "https://github.com/TQC-Solution/flutter-ai-review-bot"
-        }
+        })
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=Config.MAX_CONCURRENT_LLM_CALLS)
+        )
 
-    def generate_review(self, prompt: str) -> str:
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
+    def __enter__(self) -> OpenRouterClient:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def generate_review(self, prompt: str, cacheable_prefix: str | None = None) -> str:
         """Generate code review using OpenRouter AI.
 
-        Tries the configured model with retry logic for rate limit errors.
+        See generate_review_with_model() for the model fallback chain.
 
         Args:
             prompt: The review prompt including code diff
+            cacheable_prefix: Static leading part of the prompt to mark for
+                provider-side prompt caching (see Config.ENABLE_PROMPT_CACHING)
 
         Returns:
             Generated review text
@@ -67,23 +179,101 @@ class OpenRouterClient:
         Raises:
             OpenRouterAPIError: If API call fails
         """
-        model_name = Config.OPENROUTER_MODEL
+        return self.generate_review_with_model(prompt, cacheable_prefix)[0]
 
-        try:
-            review = self._try_model_with_retry(model_name, prompt)
-            if review:
-                return review
-            else:
-                raise OpenRouterAPIError(f"Model {model_name} returned empty response")
-        except Exception as e:
-            raise self._create_detailed_error(e)
+    def generate_review_with_model(
+        self, prompt: str, cacheable_prefix: str | None = None
+    ) -> tuple[str, str]:
+        """Generate code review and report which model wrote it.
 
-    def _try_model_with_retry(self, model_name: str, prompt: str) -> str | None:
-        """Try a specific model with retry logic for rate limits.
+        Tries the configured model, then Config.OPENROUTER_FALLBACK_MODELS in
+        order when a model is rate limited, unavailable or returns an empty
+        completion. Only the last model in the chain waits out such errors
+        with retries.
+
+        Args:
+            prompt: The review prompt including code diff
+            cacheable_prefix: Static leading part of the prompt to mark for
+                provider-side prompt caching (see Config.ENABLE_PROMPT_CACHING)
+
+        Returns:
+            Tuple of (generated review text, name of the model that answered)
+
+        Raises:
+            OpenRouterAPIError: If API call fails
+        """
+        models = (Config.OPENROUTER_MODEL, *Config.OPENROUTER_FALLBACK_MODELS)
+
+        for idx, model_name in enumerate(models):
+            is_last_model = idx == len(models) - 1
+            breaker = self._breaker_for(model_name)
+
+            # The last model is always tried: there is nothing to fall back to
+            if not is_last_model and not breaker.allow():
+                print(f"   ⏭️  Skipping {model_name} (failing, circuit open)")
+                continue
+
+            try:
+                review = self._try_model_with_retry(
+                    model_name, prompt, cacheable_prefix,
+                    retry_transient=is_last_model
+                )
+            except (OpenRouterRateLimitError, OpenRouterUnavailableError) as e:
+                breaker.record_failure()
+                if is_last_model:
+                    raise
+                reason = "rate limited" if isinstance(e, OpenRouterRateLimitError) else "unavailable"
+                print(f"   ⚠️  {model_name} is {reason}, "
+                      f"falling back to {models[idx + 1]}")
+                continue
+            except OpenRouterAPIError:
+                breaker.record_failure()
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                raise OpenRouterAPIError(f"OpenRouter API call failed: {e}")
+
+            if not review:
+                # Common for free models under load; the next model may answer
+                breaker.record_failure()
+                if is_last_model:
+                    raise OpenRouterAPIError(f"Model {model_name} returned empty response")
+                print(f"   ⚠️  {model_name} returned an empty response, "
+                      f"falling back to {models[idx + 1]}")
+                continue
+
+            breaker.record_success()
+            return review, model_name
+
+    @classmethod
+    def _breaker_for(cls, model_name: str) -> _CircuitBreaker:
+        """Get (creating on first use) the circuit breaker of a model.
+
+        Args:
+            model_name: OpenRouter model name
+
+        Returns:
+            Breaker shared by every client in this process
+        """
+        with cls._breakers_lock:
+            breaker = cls._breakers.get(model_name)
+            if breaker is None:
+                breaker = cls._breakers[model_name] = _CircuitBreaker()
+            return breaker
+
+    def _try_model_with_retry(
+        self, model_name: str, prompt: str, cacheable_prefix: str | None = None,
+        retry_transient: bool = True
+    ) -> str | None:
+        """Try a specific model with retry logic for rate limits and outages.
 
         Args:
             model_name: Name of the OpenRouter model to use
             prompt: The review prompt
+            cacheable_prefix: Static leading part of the prompt to cache
+            retry_transient: Wait and retry on 429s, timeouts and network
+                errors; if False, raise OpenRouterRateLimitError or
+                OpenRouterUnavailableError at once so the caller can fall back
 
         Returns:
             Generated text or None if model returns empty response
@@ -91,155 +281,134 @@ class OpenRouterClient:
         Raises:
             Exception: If non-retryable error occurs or max retries exceeded
         """
-        retry_delay = Config.INITIAL_RETRY_DELAY
+        # The request is identical on every attempt: build and serialize it once
+        body = self._build_request_body(model_name, prompt, cacheable_prefix)
+
+        # backoff_delay grows exponentially; retry_delay is the (jittered) wait
+        # before the next attempt, or the server's Retry-After hint if given
+        backoff_delay = Config.INITIAL_RETRY_DELAY
+        retry_delay = backoff_delay
 
         for attempt in range(Config.MAX_RETRIES + 1):
             try:
                 if attempt > 0:
                     print(f"      Retry attempt {attempt}/{Config.MAX_RETRIES} "
-                          f"after {retry_delay}s...")
+                          f"after {retry_delay:.1f}s...")
                     time.sleep(retry_delay)
 
-                # Build request payload
-                payload = {
-                    "model": model_name,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                }
-
-                # Add generation config
-                if Config.GENERATION_CONFIG:
-                    if not isinstance(Config.GENERATION_CONFIG, dict):
-                        raise OpenRouterAPIError(
-                            f"GENERATION_CONFIG must be a dict, got {type(Config.GENERATION_CONFIG).__name__}"
-                        )
-                    if "temperature" in Config.GENERATION_CONFIG:
-                        payload["temperature"] = Config.GENERATION_CONFIG["temperature"]
-                    if "top_p" in Config.GENERATION_CONFIG:
-                        payload["top_p"] = Config.GENERATION_CONFIG["top_p"]
-                    if "max_output_tokens" in Config.GENERATION_CONFIG:
-                        payload["max_tokens"] = Config.GENERATION_CONFIG["max_output_tokens"]
-
-                # Enable reasoning if supported by model
-                if Config.ENABLE_REASONING:
-                    payload["reasoning"] = {"enabled": True}
-
-                # Make API call
-                response = requests.post(
+                # Make API call (paced to stay under the requests-per-minute limit)
+                self._bucket.acquire()
+                # "with" releases the pooled connection on every exit path,
+                # including 429 retries that never read the streamed body
+                with self.session.post(
                     f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    data=json.dumps(payload),
-                    timeout=120  # 2 minute timeout
-                )
-
-                # Check for HTTP errors
-                if response.status_code == 429:
-                    # Rate limit error - retry
-                    if attempt < Config.MAX_RETRIES:
-                        print(f"      ⚠️  Rate limit hit (429), retrying in {retry_delay}s...")
-                        retry_delay *= Config.RETRY_BACKOFF_MULTIPLIER
-                        continue
-                    else:
-                        raise OpenRouterAPIError(
-                            f"Rate limit exceeded after {Config.MAX_RETRIES} retries. "
-                            f"Response: {response.text}"
+                    data=body,
+                    # Streaming: the read timeout applies between bytes, so a
+                    # stalled stream fails fast; the total is capped separately
+                    timeout=(
+                        Config.REQUEST_CONNECT_TIMEOUT,
+                        Config.STREAM_IDLE_TIMEOUT if Config.STREAM_RESPONSE else 120
+                    ),
+                    stream=Config.STREAM_RESPONSE
+                ) as response:
+                    # Check for HTTP errors
+                    if response.status_code == 429:
+                        if not retry_transient:
+                            raise OpenRouterRateLimitError(
+                                f"Rate limit exceeded (429) for {model_name}. "
+                                f"Response: {response.text}"
+                            )
+
+                        # Rate limit error - retry
+                        if attempt < Config.MAX_RETRIES:
+                            retry_after = self._parse_retry_after(response)
+                            if retry_after is None:
+                                retry_delay = _jitter(backoff_delay)
+                                backoff_delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                            elif retry_after > Config.MAX_RETRY_AFTER:
+                                raise OpenRouterRateLimitError(
+                                    f"Rate limit exceeded (429). Server asked to wait "
+                                    f"{retry_after:g}s, more than the {Config.MAX_RETRY_AFTER}s budget. "
+                                    f"Response: {response.text}"
+                                )
+                            else:
+                                retry_delay = retry_after
+                            print(f"      ⚠️  Rate limit hit (429), retrying in {retry_delay:.1f}s...")
+                            continue
+                        else:
+                            raise OpenRouterRateLimitError(
+                                f"Rate limit exceeded after {Config.MAX_RETRIES} retries.\n"
+                                f"   Check your rate limits at: https://openrouter.ai/settings/limits\n"
+                                f"   Wait and retry, or upgrade your plan\n"
+                                f"   Response: {response.text}"
+                            )
+
+                    if response.status_code == 401:
+                        raise OpenRouterAuthError(
+                            "Invalid API key (401).\n"
+                            "   Get a new API key at: https://openrouter.ai/keys\n"
+                            "   Update GitHub Secret: Settings → Secrets → OPENROUTER_API_KEY"
                         )
 
-                if response.status_code == 401:
-                    raise OpenRouterAPIError(
-                        "Invalid API key (401). "
-                        "Get a new API key at: https://openrouter.ai/keys"
-                    )
-
-                if response.status_code == 402:
-                    raise OpenRouterAPIError(
-                        "Insufficient credits (402). "
-                        "Add credits at: https://openrouter.ai/credits"
-                    )
-
-                if response.status_code == 403:
-                    raise OpenRouterAPIError(
-                        "Access forbidden (403). "
-                        "Check your API key permissions."
-                    )
+                    if response.status_code == 402:
+                        raise OpenRouterCreditsError(
+                            "Insufficient credits (402). "
+                            "Add credits at: https://openrouter.ai/credits"
+                        )
 
-                if response.status_code != 200:
-                    raise OpenRouterAPIError(
-                        f"API call failed with status {response.status_code}: {response.text}"
-                    )
+                    if response.status_code == 403:
+                        raise OpenRouterAuthError(
+                            "Access forbidden (403). "
+                            "Check your API key permissions."
+                        )
 
-                # Parse response
-                response_data = response.json()
+                    if response.status_code >= 500:
+                        raise OpenRouterUnavailableError(
+                            f"API call failed with status {response.status_code}: {response.text}"
+                        )
 
-                # Validate response_data is a dict
-                if not isinstance(response_data, dict):
-                    raise OpenRouterAPIError(
-                        f"Invalid API response format: expected dict, got {type(response_data).__name__}. "
-                        f"Response: {response_data}"
-                    )
+                    if response.status_code != 200:
+                        raise OpenRouterAPIError(
+                            f"API call failed with status {response.status_code}: {response.text}"
+                        )
 
-                if "error" in response_data:
-                    error_data = response_data["error"]
-                    # Handle different error formats: dict, list, or string
-                    if isinstance(error_data, dict):
-                        error_msg = error_data.get("message", str(error_data))
-                    elif isinstance(error_data, list):
-                        # If error is a list, convert to string representation
-                        error_msg = "; ".join(str(e) for e in error_data)
+                    # Parse response
+                    if Config.STREAM_RESPONSE:
+                        content = self._read_streamed_content(response)
                     else:
-                        error_msg = str(error_data)
-                    raise OpenRouterAPIError(f"API error: {error_msg}")
-
-                # Extract content from response
-                if "choices" not in response_data or len(response_data["choices"]) == 0:
-                    return None
-
-                # Get first choice - handle both dict and list formats
-                first_choice = response_data["choices"][0]
-                if not isinstance(first_choice, dict):
-                    raise OpenRouterAPIError(
-                        f"Unexpected response format: choices[0] is {type(first_choice).__name__}, "
-                        f"expected dict. Response: {response_data}"
-                    )
+                        content = self._parse_completion(response)
 
-                message = first_choice.get("message", {})
-                if not isinstance(message, dict):
-                    raise OpenRouterAPIError(
-                        f"Unexpected message format: message is {type(message).__name__}, "
-                        f"expected dict. Response: {response_data}"
-                    )
-
-                content = message.get("content", "")
-
-                if not content:
-                    return None
+                    if not content:
+                        return None
 
-                print(f"   ✅ Review generated successfully with {model_name}")
+                    print(f"   ✅ Review generated successfully with {model_name}")
 
-                return content
+                    return content
 
             except requests.exceptions.Timeout:
+                if not retry_transient:
+                    raise OpenRouterUnavailableError(f"Request timeout for {model_name}")
                 if attempt < Config.MAX_RETRIES:
-                    print(f"      ⚠️  Request timeout, retrying in {retry_delay}s...")
-                    retry_delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                    retry_delay = _jitter(backoff_delay)
+                    backoff_delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                    print(f"      ⚠️  Request timeout, retrying in {retry_delay:.1f}s...")
                     continue
                 else:
-                    raise OpenRouterAPIError(
+                    raise OpenRouterUnavailableError(
                         f"Request timeout after {Config.MAX_RETRIES} retries"
                     )
 
             except requests.exceptions.RequestException as e:
                 # Network errors
+                if not retry_transient:
+                    raise OpenRouterUnavailableError(f"Network error for {model_name}: {e}")
                 if attempt < Config.MAX_RETRIES:
-                    print(f"      ⚠️  Network error: {e}, retrying in {retry_delay}s...")
-                    retry_delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                    retry_delay = _jitter(backoff_delay)
+                    backoff_delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                    print(f"      ⚠️  Network error: {e}, retrying in {retry_delay:.1f}s...")
                     continue
                 else:
-                    raise OpenRouterAPIError(
+                    raise OpenRouterUnavailableError(
                         f"Network error after {Config.MAX_RETRIES} retries: {e}"
                     )
 
@@ -253,38 +422,203 @@ class OpenRouterClient:
 
         return None
 
-    def _create_detailed_error(self, error: Exception) -> OpenRouterAPIError:
-        """Create a detailed error message based on the error type.
+    def _build_request_body(
+        self, model_name: str, prompt: str, cacheable_prefix: str | None = None
+    ) -> bytes:
+        """Build the serialized chat completion request.
 
         Args:
-            error: The original exception
+            model_name: Name of the OpenRouter model to use
+            prompt: The review prompt
+            cacheable_prefix: Static leading part of the prompt to cache
 
         Returns:
-            OpenRouterAPIError with detailed message
+            UTF-8 JSON request body
+
+        Raises:
+            OpenRouterAPIError: If Config.GENERATION_CONFIG is not a dict
         """
-        if isinstance(error, OpenRouterAPIError):
-            return error
+        # Build request payload
+        payload = {
+            "model": model_name,
+            "messages": self._build_messages(prompt, cacheable_prefix),
+        }
 
-        error_msg = str(error)
+        # Add generation config
+        if Config.GENERATION_CONFIG:
+            if not isinstance(Config.GENERATION_CONFIG, dict):
+                raise OpenRouterAPIError(
+                    f"GENERATION_CONFIG must be a dict, got {type(Config.GENERATION_CONFIG).__name__}"
+                )
+            if "temperature" in Config.GENERATION_CONFIG:
+                payload["temperature"] = Config.GENERATION_CONFIG["temperature"]
+            if "top_p" in Config.GENERATION_CONFIG:
+                payload["top_p"] = Config.GENERATION_CONFIG["top_p"]
+            if "max_output_tokens" in Config.GENERATION_CONFIG:
+                payload["max_tokens"] = Config.GENERATION_CONFIG["max_output_tokens"]
 
-        if "api key" in error_msg.lower() or "401" in error_msg:
-            return OpenRouterAPIError(
-                f"Invalid OPENROUTER_API_KEY.\n"
-                f"   Get a new API key at: https://openrouter.ai/keys\n"
-                f"   Update GitHub Secret: Settings → Secrets → OPENROUTER_API_KEY"
-            )
-        elif "rate" in error_msg.lower() or "429" in error_msg:
-            return OpenRouterAPIError(
-                f"OpenRouter API rate limit exceeded.\n"
-                f"   Check your rate limits at: https://openrouter.ai/settings/limits\n"
-                f"   Wait and retry, or upgrade your plan\n"
-                f"   Error: {error}"
-            )
-        elif "credits" in error_msg.lower() or "402" in error_msg:
-            return OpenRouterAPIError(
-                f"Insufficient OpenRouter credits.\n"
-                f"   Add credits at: https://openrouter.ai/credits\n"
-                f"   Error: {error}"
+        # Enable reasoning if supported by model
+        if Config.ENABLE_REASONING:
+            payload["reasoning"] = {"enabled": True}
+
+        if Config.STREAM_RESPONSE:
+            payload["stream"] = True
+
+        return json_dumps(payload)
+
+    def _parse_completion(self, response: requests.Response) -> str:
+        """Extract the review text from a non-streaming completion response.
+
+        Args:
+            response: Successful chat completion response
+
+        Returns:
+            Generated text (empty if the model returned nothing)
+
+        Raises:
+            OpenRouterAPIError: If the response has an error or unexpected format
+        """
+        response_data = json_loads(response.content)
+
+        if isinstance(response_data, dict) and "error" in response_data:
+            raise self._error_from_payload(response_data["error"])
+
+        # Validate the shape only when the direct lookup fails
+        try:
+            if not response_data.get("choices"):
+                return ""
+            return response_data["choices"][0]["message"]["content"] or ""
+        except (AttributeError, KeyError, IndexError, TypeError) as e:
+            raise OpenRouterAPIError(
+                f"Unexpected response format ({e!r}). Response: {response_data}"
             )
+
+    def _read_streamed_content(self, response: requests.Response) -> str:
+        """Assemble the review text from a streamed (SSE) completion response.
+
+        Args:
+            response: Successful chat completion response opened with stream=True
+
+        Returns:
+            Generated text (empty if the model returned nothing)
+
+        Raises:
+            OpenRouterAPIError: If the stream reports an error or runs longer
+                than Config.STREAM_MAX_DURATION
+        """
+        parts = []
+        deadline = time.monotonic() + Config.STREAM_MAX_DURATION
+        try:
+            for raw_line in response.iter_lines():
+                if time.monotonic() > deadline:
+                    raise OpenRouterUnavailableError(
+                        f"Streamed response exceeded {Config.STREAM_MAX_DURATION}s budget"
+                    )
+
+                # Skip blank separators and SSE comments (OpenRouter keep-alives)
+                if not raw_line or raw_line.startswith(b":"):
+                    continue
+                if not raw_line.startswith(b"data:"):
+                    continue
+
+                data = raw_line[5:].strip()
+                if data == b"[DONE]":
+                    break
+
+                event = json_loads(data)
+                if "error" in event:
+                    raise self._error_from_payload(event["error"])
+
+                choices = event.get("choices") or []
+                if choices:
+                    piece = (choices[0].get("delta") or {}).get("content")
+                    if piece:
+                        parts.append(piece)
+        finally:
+            response.close()
+
+        return "".join(parts)
+
+    def _error_from_payload(self, error_data) -> OpenRouterAPIError:
+        """Build the exception for an error payload returned by OpenRouter.
+
+        Args:
+            error_data: Error field from response (dict, list, or string)
+
+        Returns:
+            OpenRouterAPIError subclass matching the error code, if known
+        """
+        # Handle different error formats: dict, list, or string
+        error_class = OpenRouterAPIError
+        if isinstance(error_data, dict):
+            error_msg = error_data.get("message", str(error_data))
+            error_class = _ERRORS_BY_STATUS.get(error_data.get("code"), OpenRouterAPIError)
+        elif isinstance(error_data, list):
+            # If error is a list, convert to string representation
+            error_msg = "; ".join(str(e) for e in error_data)
+        else:
+            error_msg = str(error_data)
+        return error_class(f"API error: {error_msg}")
+
+    def _parse_retry_after(self, response: requests.Response) -> float | None:
+        """Parse the Retry-After header of a rate-limited response.
+
+        Supports both the delay-seconds and the HTTP-date forms.
+
+        Args:
+            response: The 429 response
+
+        Returns:
+            Seconds to wait, or None if the header is missing or invalid
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def _build_messages(self, prompt: str, cacheable_prefix: str | None = None) -> list[dict]:
+        """Build the chat messages for a review request.
+
+        When prompt caching is enabled and the prompt starts with the static
+        prefix, the prefix is sent as a separate content part with a
+        cache_control breakpoint so the provider can reuse it across requests.
+
+        Args:
+            prompt: The review prompt
+            cacheable_prefix: Static leading part of the prompt
+
+        Returns:
+            List of chat messages
+        """
+        if (Config.ENABLE_PROMPT_CACHING and cacheable_prefix
+                and prompt.startswith(cacheable_prefix)):
+            content = [
+                {
+                    "type": "text",
+                    "text": cacheable_prefix,
+                    "cache_control": {"type": "ephemeral"}
+                },
+                {
+                    "type": "text",
+                    "text": prompt[len(cacheable_prefix):]
+                }
+            ]
         else:
-            return OpenRouterAPIError(f"OpenRouter API call failed: {error}")
+            content = prompt
+
+        return [
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
@@ -7,11 +7,107 @@ Handles loading of:
 """
 
 import os
+import string
 import textwrap
 
 from .config import Config
 from .diff_chunker import DiffChunker, DiffChunk
 
+# Resource locations, resolved once at import (scripts/ is the parent package dir)
+_SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_RULES_DIR = os.path.join(_SCRIPT_DIR, "rule")
+_PROMPT_FILE_EN = os.path.join(_SCRIPT_DIR, "prompts", "review_prompt_en.txt")
+_PROMPT_FILE_VI = os.path.join(_SCRIPT_DIR, "prompts", "review_prompt_vi.txt")
+
+# Minimal rules used when no rule file can be loaded
+_FALLBACK_RULES = textwrap.dedent("""
+    ## Key Flutter Review Rules:
+    - Clean Architecture: Domain must NOT import Data/Presentation layers
+    - GetX: Use init: only at root widget, Get.find() in children
+    - Assets: Use Assets.icons.iconBack (NOT hardcoded paths)
+    - i18n: Use context.tr() (NOT hardcoded strings)
+    - Error Handling: Return Either<Failure, T> in repositories
+    """)
+
+# Vietnamese template used when the prompt file cannot be loaded
+_FALLBACK_TEMPLATE_VI = """Bạn là một senior Flutter/Dart engineer. Hãy review code changes dưới đây theo coding standards của dự án.
+
+=== QUY TẮC & CHUẨN MỰC LẬP TRÌNH ===
+{coding_rules}
+
+=== NHIỆM VỤ CỦA BẠN ===
+Hãy phân tích code diff và CHỈ liệt kê những vấn đề/vi phạm thực sự tìm thấy.
+
+YÊU CẦU QUAN TRỌNG:
+- Trả lời HOÀN TOÀN BẰNG TIẾNG VIỆT
+- Format: Markdown với emoji (🔴 lỗi nghiêm trọng, ⚠️ cảnh báo, 💡 gợi ý)
+
+=== CODE DIFF CẦN REVIEW ===
+{code_diff}
+"""
+
+# Appended to a truncated diff; dedented once at import time
+_TRUNCATION_WARNING_EN = textwrap.dedent("""
+
+    ⚠️ **IMPORTANT**: The diff above was truncated due to size limits.
+    Only the first portion of changed files is shown.
+    Please review ONLY the code that is visible above.
+    """)
+
+_TRUNCATION_WARNING_VI = textwrap.dedent("""
+
+    ⚠️ **LƯU Ý QUAN TRỌNG**: Diff phía trên đã bị cắt bớt do giới hạn kích thước.
+    Chỉ hiển thị phần đầu của các file thay đổi.
+    Hãy chỉ review code mà bạn NHÌN THẤY ở phía trên.
+    KHÔNG đưa ra nhận xét về các file không có trong diff.
+    """)
+
+
+def _read_text_file(path: str) -> str:
+    """Read a UTF-8 text file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        File content
+    """
+    # One read and one decode instead of text mode's incremental decoder
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        # Same newline translation text mode would apply (CRLF rule files)
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _split_template(template: str, split_at: str, **values: str) -> tuple[str, str]:
+    """Render a prompt template around one placeholder.
+
+    Everything except the split placeholder is filled in once, so each
+    prompt is just head + content + tail instead of a full template render.
+
+    Args:
+        template: Template with {coding_rules} and {code_diff} placeholders
+        split_at: Placeholder name to leave open
+        **values: Values of the other placeholders
+
+    Returns:
+        Tuple of (rendered text before the placeholder, rendered text after)
+    """
+    head = []
+    tail = []
+    parts = head
+    for literal_text, field_name, _, _ in string.Formatter().parse(template):
+        parts.append(literal_text)
+        if field_name is None:
+            continue
+        if field_name == split_at and parts is head:
+            parts = tail
+            continue
+        parts.append(values[field_name])
+    return "".join(head), "".join(tail)
+
 
 class PromptBuilder:
     """Builder class for constructing code review prompts."""
@@ -23,9 +119,14 @@ class PromptBuilder:
             language: Language for prompts ('vietnamese' or 'english')
         """
         self.language = language
-        self.script_dir = os.path.dirname(os.path.dirname(__file__))
+        self.script_dir = _SCRIPT_DIR
         self.chunker = DiffChunker()
 
+        # Loaded on first use; rules and template don't change during a run
+        self._coding_rules = None
+        self._prompt_template = None
+        self._prompt_parts = None  # (head, tail) around {code_diff}
+
     def build_prompt(self, diff_text: str) -> str:
         """Build complete review prompt from diff and templates.
 
@@ -40,24 +141,14 @@ class PromptBuilder:
             diff_text, Config.MAX_DIFF_LENGTH
         )
 
-        # Load coding rules
-        coding_rules = self._load_coding_rules()
-
-        # Load prompt template
-        prompt_template = self._load_prompt_template()
-
         # Add truncation warning if needed
         truncation_warning = ""
         if was_truncated and Config.WARN_DIFF_TRUNCATED:
             truncation_warning = self._get_truncation_warning()
 
-        # Build final prompt
-        prompt = prompt_template.format(
-            coding_rules=coding_rules,
-            code_diff=short_diff + truncation_warning
-        )
-
-        return prompt
+        # Build final prompt around the pre-rendered template + rules
+        head, tail = self._get_prompt_parts()
+        return "".join((head, short_diff, truncation_warning, tail))
 
     def build_chunked_prompts(self, diff_text: str) -> list[tuple[str, DiffChunk]]:
         """Build multiple prompts for large diffs using chunking strategy.
@@ -68,20 +159,26 @@ class PromptBuilder:
         Returns:
             List of (prompt, chunk) tuples for each chunk to review
         """
-        # Check if chunking is needed
-        if not self.chunker.should_chunk(diff_text):
+        # Most PRs are small: below both single-pass thresholds (estimated
+        # tokens never exceed the char count) skip chunking the diff at all.
+        # File list as chunk_diff() would give for a single chunk.
+        chunker = self.chunker
+        if len(diff_text) <= min(chunker.SINGLE_PASS_CHAR_THRESHOLD,
+                                 chunker.SINGLE_PASS_TOKEN_THRESHOLD):
+            files = chunker.get_file_paths(diff_text) or ["unknown"]
+            return [(self.build_prompt(diff_text), DiffChunk(diff_text, files, 0, 1))]
+
+        # Chunk the diff (parses it once; small diffs come back as one chunk)
+        chunks = self.chunker.chunk_diff(diff_text)
+        if len(chunks) == 1:
             # Single-pass review
             prompt = self.build_prompt(diff_text)
-            chunk = DiffChunk(diff_text, ["all"], 0, 1)
-            return [(prompt, chunk)]
+            return [(prompt, chunks[0])]
 
-        # Chunk the diff
-        chunks = self.chunker.chunk_diff(diff_text)
         print(f"   📦 Large PR detected: splitting into {len(chunks)} chunks")
 
-        # Load common parts once
-        coding_rules = self._load_coding_rules()
-        prompt_template = self._load_prompt_template()
+        # Template and rules are rendered once; each chunk is a plain join
+        head, tail = self._get_prompt_parts()
 
         # Build prompts for each chunk
         prompts = []
@@ -97,29 +194,65 @@ class PromptBuilder:
                     chunk_info = f"\n\n**LƯU Ý**: Đây là phần {chunk.chunk_index + 1}/{chunk.total_chunks}. Hãy tập trung review các files này.\n"
 
             # Build prompt for this chunk
-            prompt = prompt_template.format(
-                coding_rules=coding_rules,
-                code_diff=chunk_header + chunk_info + chunk.content
-            )
+            prompt = "".join((head, chunk_header, chunk_info, chunk.content, tail))
 
             prompts.append((prompt, chunk))
 
         return prompts
 
+    def get_cacheable_prefix(self) -> str:
+        """Get the static prompt prefix shared by every prompt of this builder.
+
+        This is the template text before the {code_diff} placeholder with the
+        coding rules filled in. It is identical across chunks and PRs, so it can
+        be marked for provider-side prompt caching.
+
+        Returns:
+            Prompt prefix string
+        """
+        return self._get_prompt_parts()[0]
+
+    def _get_prompt_parts(self) -> tuple[str, str]:
+        """Get the rendered prompt text before and after {code_diff}.
+
+        Returns:
+            Tuple of (head, tail); a prompt is head + diff + tail
+        """
+        if self._prompt_parts is None:
+            self._prompt_parts = _split_template(
+                self._load_prompt_template(),
+                "code_diff",
+                coding_rules=self._load_coding_rules()
+            )
+        return self._prompt_parts
+
     def _load_coding_rules(self) -> str:
+        """Get the coding rules, reading them on the first call only.
+
+        Returns:
+            Combined coding rules text from all rule files or fallback minimal rules
+        """
+        if self._coding_rules is None:
+            self._coding_rules = self._read_coding_rules()
+        return self._coding_rules
+
+    def _read_coding_rules(self) -> str:
         """Load coding rules from all rule files in the rule/ directory.
 
         Returns:
             Combined coding rules text from all rule files or fallback minimal rules
         """
-        rules_dir = os.path.join(self.script_dir, "rule")
+        rules_dir = _RULES_DIR
 
         try:
-            # Get all markdown files in the rule directory
-            rule_files = sorted([
-                f for f in os.listdir(rules_dir)
-                if f.endswith('.md')
-            ])
+            # Get all markdown files in the rule directory; scandir entries
+            # carry their type and full path, so no extra stat/join per file
+            with os.scandir(rules_dir) as entries:
+                rule_files = sorted(
+                    (entry for entry in entries
+                     if entry.name.endswith('.md') and entry.is_file()),
+                    key=lambda entry: entry.name
+                )
 
             if not rule_files:
                 print(f"⚠️ Warning: No rule files found in {rules_dir}")
@@ -127,15 +260,14 @@ class PromptBuilder:
 
             # Load and combine all rule files
             all_rules = []
+            loaded_names = []
             for rule_file in rule_files:
-                rule_path = os.path.join(rules_dir, rule_file)
                 try:
-                    with open(rule_path, "r", encoding="utf-8") as f:
-                        rule_content = f.read()
-                        all_rules.append(rule_content)
-                    print(f"   ✅ Loaded rule: {rule_file}")
+                    rule_content = _read_text_file(rule_file.path)
+                    all_rules.append(rule_content)
+                    loaded_names.append(rule_file.name)
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not load rule file {rule_file}: {e}")
+                    print(f"⚠️ Warning: Could not load rule file {rule_file.name}: {e}")
 
             if not all_rules:
                 print(f"⚠️ Warning: No rules could be loaded")
@@ -143,7 +275,8 @@ class PromptBuilder:
 
             # Combine all rules with separators
             combined_rules = "\n\n---\n\n".join(all_rules)
-            print(f"   ✅ Successfully loaded {len(all_rules)} rule file(s)")
+            # One summary line instead of a write per file
+            print(f"   ✅ Loaded {len(all_rules)} rule file(s): {', '.join(loaded_names)}")
             return combined_rules
 
         except Exception as e:
@@ -151,23 +284,28 @@ class PromptBuilder:
             return self._get_fallback_rules()
 
     def _load_prompt_template(self) -> str:
+        """Get the prompt template, reading it on the first call only.
+
+        Returns:
+            Prompt template string with {coding_rules} and {code_diff} placeholders
+        """
+        if self._prompt_template is None:
+            self._prompt_template = self._read_prompt_template()
+        return self._prompt_template
+
+    def _read_prompt_template(self) -> str:
         """Load prompt template based on language.
 
         Returns:
             Prompt template string with {coding_rules} and {code_diff} placeholders
         """
         if self.language == "english":
-            prompt_file = os.path.join(
-                self.script_dir, "prompts", "review_prompt_en.txt"
-            )
+            prompt_file = _PROMPT_FILE_EN
         else:  # Vietnamese (default)
-            prompt_file = os.path.join(
-                self.script_dir, "prompts", "review_prompt_vi.txt"
-            )
+            prompt_file = _PROMPT_FILE_VI
 
         try:
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                template = f.read()
+            template = _read_text_file(prompt_file)
             print(f"   ✅ Loaded prompt template: {prompt_file}")
             return template
         except Exception as e:
@@ -180,14 +318,7 @@ class PromptBuilder:
         Returns:
             Minimal coding rules
         """
-        return textwrap.dedent("""
-        ## Key Flutter Review Rules:
-        - Clean Architecture: Domain must NOT import Data/Presentation layers
-        - GetX: Use init: only at root widget, Get.find() in children
-        - Assets: Use Assets.icons.iconBack (NOT hardcoded paths)
-        - i18n: Use context.tr() (NOT hardcoded strings)
-        - Error Handling: Return Either<Failure, T> in repositories
-        """)
+        return _FALLBACK_RULES
 
     def _get_fallback_template(self) -> str:
         """Get fallback prompt template if file cannot be loaded.
@@ -195,24 +326,14 @@ class PromptBuilder:
         Returns:
             Fallback Vietnamese template
         """
-        return """Bạn là một senior Flutter/Dart engineer. Hãy review code changes dưới đây theo coding standards của dự án.
-
-=== QUY TẮC & CHUẨN MỰC LẬP TRÌNH ===
-{coding_rules}
-
-=== NHIỆM VỤ CỦA BẠN ===
-Hãy phân tích code diff và CHỈ liệt kê những vấn đề/vi phạm thực sự tìm thấy.
-
-YÊU CẦU QUAN TRỌNG:
-- Trả lời HOÀN TOÀN BẰNG TIẾNG VIỆT
-- Format: Markdown với emoji (🔴 lỗi nghiêm trọng, ⚠️ cảnh báo, 💡 gợi ý)
-
-=== CODE DIFF CẦN REVIEW ===
-{code_diff}
-"""
+        return _FALLBACK_TEMPLATE_VI
 
     def _truncate_diff_smartly(self, diff_text: str, max_length: int) -> tuple[str, bool]:
-        """Truncate diff at file boundaries to preserve structure integrity.
+        """Truncate diff at file and hunk boundaries to preserve structure integrity.
+
+        Files that fit are kept whole; the first file that doesn't fit keeps its
+        header and leading whole hunks. A trailing marker states how many files
+        were dropped.
 
         Args:
             diff_text: Full diff text
@@ -224,19 +345,13 @@ YÊU CẦU QUAN TRỌNG:
         if len(diff_text) <= max_length:
             return diff_text, False
 
-        # Find all file boundaries (diff --git markers)
-        file_markers = []
-        lines = diff_text.split('\n')
-        current_pos = 0
-
-        for i, line in enumerate(lines):
-            if line.startswith('diff --git '):
-                file_markers.append({
-                    'line_num': i,
-                    'position': current_pos,
-                    'file_path': self._extract_file_path(line)
-                })
-            current_pos += len(line) + 1  # +1 for newline
+        # Find all file boundaries (offsets of 'diff --git' lines); str.find
+        # walks the buffer in C without splitting the diff into lines
+        file_markers = [0] if diff_text.startswith('diff --git ') else []
+        pos = diff_text.find('\ndiff --git ')
+        while pos != -1:
+            file_markers.append(pos + 1)
+            pos = diff_text.find('\ndiff --git ', pos + 1)
 
         if not file_markers:
             # No file markers found, use simple truncation
@@ -247,54 +362,74 @@ YÊU CẦU QUAN TRỌNG:
         # A file is "complete" if the NEXT file marker or end-of-diff is within limit
         last_complete_file_idx = -1
 
-        for i, marker in enumerate(file_markers):
-            # Check if next file marker or end of diff is within limit
+        for i in range(len(file_markers)):
             if i + 1 < len(file_markers):
-                next_marker_pos = file_markers[i + 1]['position']
-                if next_marker_pos <= max_length:
-                    last_complete_file_idx = i
+                file_end = file_markers[i + 1]
             else:
-                # This is the last file - check if it starts within limit
-                if marker['position'] < max_length:
-                    last_complete_file_idx = i
+                file_end = len(diff_text)
+            if file_end > max_length:
+                break
+            last_complete_file_idx = i
+
+        # Complete files go in as-is; the first file that doesn't fit is packed
+        # with as many whole hunks as the remaining budget allows
+        cut_position = (
+            file_markers[last_complete_file_idx + 1]
+            if last_complete_file_idx >= 0 else file_markers[0]
+        )
+        partial_idx = last_complete_file_idx + 1
+        partial_start = file_markers[partial_idx]
+        if partial_idx + 1 < len(file_markers):
+            partial_end = file_markers[partial_idx + 1]
+        else:
+            partial_end = len(diff_text)
+        partial_diff = self._pack_hunks(
+            diff_text[partial_start:partial_end], max_length - cut_position
+        )
 
-        if last_complete_file_idx == -1:
-            # Even first file doesn't fit, truncate at max_length
+        if last_complete_file_idx == -1 and not partial_diff:
+            # Not even one hunk of the first file fits, truncate at max_length
             print("   ⚠️ First file too large, truncating at max length")
             return diff_text[:max_length], True
 
-        # Calculate position to cut (at next file or end)
-        if last_complete_file_idx + 1 < len(file_markers):
-            cut_position = file_markers[last_complete_file_idx + 1]['position']
-            is_truncated = True  # There are more files after this
-        else:
-            # Last file - include everything
-            cut_position = len(diff_text)
-            is_truncated = False
-
-        truncated = diff_text[:cut_position].rstrip()
+        truncated = (diff_text[:cut_position] + partial_diff).rstrip()
         total_files = len(file_markers)
         included_files = last_complete_file_idx + 1
+        omitted_files = total_files - included_files - (1 if partial_diff else 0)
+
+        # Let the model know exactly how much context was cut
+        if omitted_files:
+            truncated += f"\n\n... ({omitted_files} file(s) truncated)"
 
-        if is_truncated:
-            print(f"   ⚠️ Diff truncated: {included_files}/{total_files} files included "
-                  f"({len(truncated)}/{len(diff_text)} chars)")
+        partial_note = " + 1 partial" if partial_diff else ""
+        print(f"   ⚠️ Diff truncated: {included_files}{partial_note}/{total_files} files included "
+              f"({len(truncated)}/{len(diff_text)} chars)")
 
-        return truncated, is_truncated
+        return truncated, True
 
-    def _extract_file_path(self, diff_line: str) -> str:
-        """Extract file path from 'diff --git a/path b/path' line.
+    def _pack_hunks(self, file_diff: str, budget: int) -> str:
+        """Pack the file header and as many whole hunks as fit in the budget.
 
         Args:
-            diff_line: Line starting with 'diff --git'
+            file_diff: Diff of a single file (starting at its 'diff --git' line)
+            budget: Maximum number of characters to return
 
         Returns:
-            File path (b/ path)
+            File header plus leading whole hunks, or empty string if not even
+            the first hunk fits
         """
-        parts = diff_line.split(' ')
-        if len(parts) >= 4:
-            return parts[3]  # b/path/to/file
-        return "unknown"
+        hunk_starts = self.chunker.get_hunk_starts(file_diff)
+        if not hunk_starts:
+            return ""
+
+        hunk_ends = hunk_starts[1:] + [len(file_diff)]
+        packed_end = 0
+        for hunk_start, hunk_end in zip(hunk_starts, hunk_ends):
+            if hunk_end > budget:
+                break
+            packed_end = hunk_end
+
+        return file_diff[:packed_end]
 
     def _get_truncation_warning(self) -> str:
         """Get truncation warning message based on language.
@@ -303,17 +438,6 @@ YÊU CẦU QUAN TRỌNG:
             Warning message to append to diff
         """
         if self.language == "english":
-            return textwrap.dedent("""
-
-            ⚠️ **IMPORTANT**: The diff above was truncated due to size limits.
-            Only the first portion of changed files is shown.
-            Please review ONLY the code that is visible above.
-            """)
+            return _TRUNCATION_WARNING_EN
         else:  # Vietnamese
-            return textwrap.dedent("""
-
-            ⚠️ **LƯU Ý QUAN TRỌNG**: Diff phía trên đã bị cắt bớt do giới hạn kích thước.
-            Chỉ hiển thị phần đầu của các file thay đổi.
-            Hãy chỉ review code mà bạn NHÌN THẤY ở phía trên.
-            KHÔNG đưa ra nhận xét về các file không có trong diff.
-            """)
+            return _TRUNCATION_WARNING_VI
@@ -0,0 +1,47 @@
+"""Client-side request rate limiting.
+
+Chunk reviews, batch-mode PRs and the parts of a long review all fire
+requests in bursts. Pacing them locally costs a known, short wait instead of
+a 429 and the server-chosen backoff that follows it.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how often a request may start."""
+
+    def __init__(self, per_minute: float, burst: int):
+        """Initialize token bucket.
+
+        Args:
+            per_minute: Sustained number of requests allowed per minute
+                (0 disables limiting)
+            burst: Requests that may start back to back before pacing kicks in
+        """
+        self.rate = per_minute / 60  # tokens per second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is available."""
+        if self.rate <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            # Reserve the token even if it is not there yet (the balance goes
+            # negative), so later callers queue behind us; sleep outside the lock
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            self._tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
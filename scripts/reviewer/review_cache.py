@@ -0,0 +1,127 @@
+"""On-disk cache of generated reviews keyed by prompt content.
+
+CI re-runs (flaky jobs, manual re-triggers, pushes touching only some files)
+often review diff chunks that did not change. Caching the AI response by a
+hash of everything that shapes it lets those runs reuse the previous review
+without spending an OpenRouter call.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+from .config import Config
+
+# Names of the files put() writes: "<sha256>.md" entries and the mkstemp
+# temporaries left behind by an interrupted write
+_ENTRY_NAME_RE = re.compile(r'[0-9a-f]{64}\.md|tmp[a-z0-9_]{8}\.tmp')
+
+
+class ReviewCache:
+    """File-per-entry cache of review texts with a time-to-live."""
+
+    def __init__(self, cache_dir: str, ttl: int):
+        """Initialize review cache.
+
+        Args:
+            cache_dir: Directory holding one file per cached review
+            ttl: Seconds a cached review stays valid (0 disables the cache)
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.ttl = ttl
+
+    def get(self, content: str) -> str | None:
+        """Look up the review generated for some content.
+
+        Reviews written by any model of the fallback chain are reused,
+        preferring the configured model.
+
+        Args:
+            content: Text that determines the review (static prompt prefix
+                plus the chunk's diff)
+
+        Returns:
+            Cached review text, or None on miss/expiry
+        """
+        if self.ttl <= 0:
+            return None
+
+        for model in (Config.OPENROUTER_MODEL, *Config.OPENROUTER_FALLBACK_MODELS):
+            path = self._path_for(content, model)
+            try:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    continue
+                with open(path, "rb") as f:
+                    return f.read().decode("utf-8")
+            except OSError:
+                continue
+        return None
+
+    def put(self, content: str, review: str, model: str):
+        """Store the review generated for some content.
+
+        The file is written to a temporary name and renamed into place, so
+        concurrent readers never see a partial review. Failures only log a
+        warning; caching is best effort.
+
+        Args:
+            content: Text that determines the review (see get())
+            review: Generated review text
+            model: Model that generated the review
+        """
+        if self.ttl <= 0:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix="tmp", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(review.encode("utf-8"))
+            os.replace(tmp_path, self._path_for(content, model))
+        except OSError as e:
+            print(f"   ⚠️  Could not write review cache: {e}")
+
+    def prune(self):
+        """Delete expired entries so a persisted cache directory stays small.
+
+        Only files put() writes are touched, as AI_REVIEW_CACHE_DIR may point
+        at a directory shared with other files.
+        """
+        if self.ttl <= 0:
+            return
+
+        cutoff = time.time() - self.ttl
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return  # No cache directory yet
+
+        for entry in entries:
+            if not _ENTRY_NAME_RE.fullmatch(entry.name):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue  # Unreadable or already gone; keep pruning the rest
+
+    def _path_for(self, content: str, model: str) -> str:
+        """Get the cache file path for some content.
+
+        The key covers the model and language as well as the content, which
+        contains the template, coding rules and diff.
+
+        Args:
+            content: Text that determines the review
+            model: Model that generated the review
+
+        Returns:
+            Path of the cache file
+        """
+        key = hashlib.sha256()
+        for part in (model, Config.REVIEW_LANGUAGE, content):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return os.path.join(self.cache_dir, key.hexdigest() + ".md")
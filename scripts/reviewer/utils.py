@@ -4,8 +4,20 @@ Contains helper functions for:
 - Parsing GitHub references
 - Validation
 - Formatting
+- JSON encoding/decoding
 """
 
+import json
+import re
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:
+    orjson = None
+
+# refs/pull/<PR>/merge or refs/pull/<PR>/head
+_PR_REF_RE = re.compile(r"^refs/pull/(\d+)(?:/(?:merge|head))?$")
+
 
 def get_pr_number_from_ref(ref: str) -> str | None:
     """Extract PR number from GitHub ref.
@@ -24,12 +36,68 @@ def get_pr_number_from_ref(ref: str) -> str | None:
         >>> get_pr_number_from_ref('refs/heads/main')
         None
     """
-    # Expected formats:
-    # refs/pull/<PR>/merge or refs/pull/<PR>/head
-    parts = ref.split("/")
-    if len(parts) >= 3 and parts[1] == "pull":
-        return parts[2]
-    return None
+    match = _PR_REF_RE.match(ref)
+    return match.group(1) if match else None
+
+
+def get_pr_numbers(ref: str, pr_numbers: str = "") -> list[str]:
+    """Resolve the PR numbers to review.
+
+    An explicit list (e.g. from GITHUB_PR_NUMBERS) enables batch mode and takes
+    precedence; otherwise the single PR from the GitHub ref is used.
+
+    Args:
+        ref: GitHub ref string (e.g., 'refs/pull/123/merge')
+        pr_numbers: Comma- or space-separated PR numbers (e.g., '12, 15 18')
+
+    Returns:
+        List of PR numbers as strings (empty if none found)
+
+    Examples:
+        >>> get_pr_numbers('refs/heads/main', '12, 15 18')
+        ['12', '15', '18']
+        >>> get_pr_numbers('refs/pull/123/merge')
+        ['123']
+    """
+    numbers = [n for n in pr_numbers.replace(",", " ").split() if n.isdigit()]
+    if numbers:
+        # Keep order, drop duplicates
+        return list(dict.fromkeys(numbers))
+
+    pr_number = get_pr_number_from_ref(ref)
+    return [pr_number] if pr_number else []
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON.
+
+    Uses orjson (C extension) when installed, stdlib json otherwise.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON document as bytes, ready to send as a request body
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: bytes | str):
+    """Parse a JSON document.
+
+    Uses orjson (C extension) when installed, stdlib json otherwise.
+
+    Args:
+        data: JSON document (e.g. a response body)
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def format_validation_errors(errors: list[str]) -> str:
@@ -72,17 +140,65 @@ def create_fallback_comment(language: str, error_message: str) -> str:
         )
 
 
+def create_generated_only_comment(language: str, file_paths: list[str]) -> str:
+    """Create the comment posted when a PR only changes generated files.
+
+    Args:
+        language: 'english' or 'vietnamese'
+        file_paths: Changed (generated) file paths
+
+    Returns:
+        Formatted comment
+    """
+    file_list = "\n".join(f"- `{path}`" for path in file_paths)
+    if language == "english":
+        return (
+            "✅ This PR only contains generated or lock files, so no AI review is needed.\n\n"
+            f"Changed files:\n{file_list}"
+        )
+    else:
+        return (
+            "✅ PR này chỉ gồm file sinh tự động hoặc file lock, không cần AI review.\n\n"
+            f"Các file thay đổi:\n{file_list}"
+        )
+
+
+def create_whitespace_only_comment(language: str) -> str:
+    """Create the comment posted when a PR only changes whitespace.
+
+    Args:
+        language: 'english' or 'vietnamese'
+
+    Returns:
+        Formatted comment
+    """
+    if language == "english":
+        return (
+            "✅ This PR only changes whitespace or line breaks "
+            "(e.g. formatting), so no AI review is needed."
+        )
+    else:
+        return (
+            "✅ PR này chỉ thay đổi khoảng trắng hoặc xuống dòng "
+            "(ví dụ: format code), không cần AI review."
+        )
+
+
 def print_usage_instructions(ref: str):
     """Print instructions for running the script.
 
     Args:
         ref: The GITHUB_REF value that was provided
     """
-    print("⚠️ Could not determine PR number from GITHUB_REF.")
-    print(f"   Expected format: refs/pull/<NUMBER>/merge or refs/pull/<NUMBER>/head")
-    print(f"   Got: '{ref}'")
-    print("\n💡 This script is designed to run in GitHub Actions, not locally.")
-    print("   To test locally, set environment variables:")
-    print("   export GITHUB_REF='refs/pull/4/merge'")
-    print("   export GITHUB_TOKEN='your_github_token'")
-    print("   export GITHUB_REPOSITORY='owner/repo'")
+    print("\n".join([
+        "⚠️ Could not determine PR number from GITHUB_REF.",
+        "   Expected format: refs/pull/<NUMBER>/merge or refs/pull/<NUMBER>/head",
+        f"   Got: '{ref}'",
+        "\n💡 This script is designed to run in GitHub Actions, not locally.",
+        "   To test locally, set environment variables:",
+        "   export GITHUB_REF='refs/pull/4/merge'",
+        "   export GITHUB_TOKEN='your_github_token'",
+        "   export GITHUB_REPOSITORY='owner/repo'",
+        "\n   To review several PRs in one run (batch mode):",
+        "   export GITHUB_PR_NUMBERS='12,15,18'   # or: ai_review.py --prs 12,15,18",
+    ]))
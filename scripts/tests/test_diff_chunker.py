@@ -0,0 +1,344 @@
+"""Tests for DiffChunker: chunking, generated files and whitespace-only diffs.
+
+Run from scripts/: python -m unittest discover -s tests -t .
+"""
+
+import re
+import unittest
+
+from reviewer.diff_chunker import DiffChunker, _glob_regex, estimate_tokens
+
+
+def file_diff(path, *hunk_lines, header=()):
+    """Build a one-hunk diff for a single file."""
+    return "\n".join([
+        f"diff --git a/{path} b/{path}",
+        *header,
+        "index 1111111..2222222 100644",
+        f"--- a/{path}",
+        f"+++ b/{path}",
+        "@@ -1,3 +1,3 @@",
+        *hunk_lines,
+        "",
+    ])
+
+
+def sized_file_diff(path, length):
+    """Build a one-hunk diff for a single file, exactly length chars long."""
+    diff = file_diff(path, "+")
+    assert length >= len(diff), "length shorter than the diff header"
+    return diff[:-1] + "x" * (length - len(diff)) + "\n"
+
+
+def multi_hunk_file_diff(path, hunk_count, hunk_length):
+    """Build a file diff with several hunks of exactly hunk_length chars."""
+    header = file_diff(path)[:-len("@@ -1,3 +1,3 @@\n")]
+    hunks = []
+    for i in range(hunk_count):
+        hunk_header = f"@@ -{i * 10 + 1},1 +{i * 10 + 1},1 @@\n+"
+        hunks.append(hunk_header + "x" * (hunk_length - len(hunk_header) - 1) + "\n")
+    return header, hunks
+
+
+class ChunkDiffTest(unittest.TestCase):
+    """How large diffs are cut into chunks."""
+
+    def setUp(self):
+        self.chunker = DiffChunker()
+        # Small limits so a handful of short files already needs chunking
+        self.chunker.SINGLE_PASS_FILE_THRESHOLD = 1
+        self.chunker.SINGLE_PASS_CHAR_THRESHOLD = 100
+        self.chunker.MAX_CHUNK_SIZE = 1000
+        self.chunker.MAX_CHUNK_TOKENS = 1000
+
+    def test_small_diff_is_single_chunk_with_real_paths(self):
+        chunker = DiffChunker()
+        diff = sized_file_diff("lib/a.dart", 200) + sized_file_diff("lib/b.dart", 200)
+        chunks = chunker.chunk_diff(diff)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].content, diff)
+        self.assertEqual(chunks[0].files, ["lib/a.dart", "lib/b.dart"])
+        self.assertEqual(chunks[0].get_header(), "")
+
+    def test_files_are_packed_best_fit_decreasing(self):
+        # 600+400 and 700+300 fill two chunks exactly; filling one chunk at
+        # a time in diff order would need three
+        sizes = {"lib/a.dart": 600, "lib/b.dart": 700, "lib/c.dart": 400, "lib/d.dart": 300}
+        diffs = {path: sized_file_diff(path, size) for path, size in sizes.items()}
+        chunks = self.chunker.chunk_diff("".join(diffs.values()))
+
+        self.assertEqual([chunk.files for chunk in chunks],
+                         [["lib/a.dart", "lib/c.dart"], ["lib/b.dart", "lib/d.dart"]])
+        for chunk in chunks:
+            # Pieces keep diff order inside a chunk
+            self.assertEqual(chunk.content, "".join(diffs[path] for path in chunk.files))
+            self.assertEqual(len(chunk.content), 1000)
+            self.assertEqual(chunk.total_chunks, 2)
+        self.assertEqual([chunk.chunk_index for chunk in chunks], [0, 1])
+
+    def test_chunks_respect_size_limits(self):
+        sizes = [230, 520, 190, 610, 480, 175, 300, 260, 940, 145]
+        diffs = [sized_file_diff(f"lib/f{i}.dart", size) for i, size in enumerate(sizes)]
+        chunks = self.chunker.chunk_diff("".join(diffs))
+
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.content), self.chunker.MAX_CHUNK_SIZE)
+        # Every file lands in exactly one chunk
+        self.assertEqual(sorted(path for chunk in chunks for path in chunk.files),
+                         sorted(f"lib/f{i}.dart" for i in range(len(sizes))))
+        self.assertEqual(sum(len(chunk.content) for chunk in chunks), sum(sizes))
+        self.assertEqual(len(chunks), 4)  # 3850 chars can't fit in fewer
+
+    def test_token_limit_applies_alongside_char_limit(self):
+        self.chunker.MAX_CHUNK_TOKENS = 150
+        diffs = [sized_file_diff(f"lib/f{i}.dart", 400) for i in range(3)]  # 100 tokens each
+        chunks = self.chunker.chunk_diff("".join(diffs))
+
+        self.assertEqual(len(chunks), 3)
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk.content), 150)
+
+    def test_oversized_file_is_split_at_hunks_within_limits(self):
+        self.chunker.MAX_CHUNK_SIZE = 500
+        header, hunks = multi_hunk_file_diff("lib/big.dart", 6, 150)
+        pieces = self.chunker._split_oversized_file(header + "".join(hunks))
+
+        self.assertGreater(len(pieces), 1)
+        for piece in pieces:
+            # Every piece repeats the file header
+            self.assertTrue(piece.startswith(header))
+            self.assertLessEqual(len(piece), 500)
+        self.assertEqual("".join(piece[len(header):] for piece in pieces), "".join(hunks))
+
+    def test_oversized_file_pieces_become_separate_chunks(self):
+        self.chunker.MAX_CHUNK_SIZE = 500
+        header, hunks = multi_hunk_file_diff("lib/big.dart", 6, 150)
+        chunks = self.chunker.chunk_diff(header + "".join(hunks) + sized_file_diff("lib/a.dart", 200))
+
+        self.assertGreater(len(chunks), 2)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.content), 500)
+        self.assertIn("lib/a.dart", [path for chunk in chunks for path in chunk.files])
+
+    def test_file_within_limits_or_with_one_hunk_is_not_split(self):
+        small = sized_file_diff("lib/a.dart", 300)
+        self.assertEqual(self.chunker._split_oversized_file(small), [small])
+
+        huge_hunk = sized_file_diff("lib/b.dart", 5000)
+        self.assertEqual(self.chunker._split_oversized_file(huge_hunk), [huge_hunk])
+
+
+class StripGeneratedFilesTest(unittest.TestCase):
+    """Which files are left out of the prompt."""
+
+    def test_arb_sources_are_kept_and_gen_l10n_output_is_stripped(self):
+        arb = file_diff("lib/l10n/app_en.arb", '-  "title": "Home"', '+  "title": "Trang chủ"')
+        generated = file_diff(
+            "lib/l10n/app_localizations_en.dart",
+            "-  String get title => 'Home';",
+            "+  String get title => 'Trang chủ';",
+        )
+        diff, omitted = DiffChunker().strip_generated_files(arb + generated)
+        self.assertEqual(diff, arb)
+        self.assertEqual(omitted, ["lib/l10n/app_localizations_en.dart"])
+
+    def test_quoted_header_after_generated_file_is_kept(self):
+        # git quotes paths with non-ASCII characters in the header
+        generated = file_diff("lib/model.g.dart", "-  int a;", "+  int b;")
+        quoted = "\n".join([
+            'diff --git "a/lib/caf\\303\\251.dart" "b/lib/caf\\303\\251.dart"',
+            "index 1111111..2222222 100644",
+            '--- "a/lib/caf\\303\\251.dart"',
+            '+++ "b/lib/caf\\303\\251.dart"',
+            "@@ -1 +1 @@",
+            "-  final price = 1;",
+            "+  final price = 2;",
+            "",
+        ])
+        chunker = DiffChunker()
+        diff, omitted = chunker.strip_generated_files(generated + quoted)
+        self.assertEqual(diff, quoted)
+        self.assertEqual(omitted, ["lib/model.g.dart"])
+        self.assertEqual(chunker.get_file_paths(generated + quoted), ["lib/model.g.dart", "lib/café.dart"])
+        self.assertFalse(chunker.is_generated_only(generated + quoted))
+
+
+class GeneratedFilePatternsTest(unittest.TestCase):
+    """How Config.GENERATED_FILE_PATTERNS globs match paths."""
+
+    def test_pattern_without_slash_matches_file_name_in_any_directory(self):
+        regex = re.compile(_glob_regex("*.g.dart") + r"\Z")
+        self.assertTrue(regex.match("model.g.dart"))
+        self.assertTrue(regex.match("lib/src/model.g.dart"))
+        self.assertFalse(regex.match("lib/model.g.dart.orig"))
+
+    def test_pattern_with_slash_matches_from_repository_root(self):
+        regex = re.compile(_glob_regex("lib/generated/*.dart") + r"\Z")
+        self.assertTrue(regex.match("lib/generated/assets.dart"))
+        self.assertFalse(regex.match("packages/app/lib/generated/assets.dart"))
+        self.assertFalse(regex.match("lib/generated/nested/assets.dart"))
+
+
+class IsWhitespaceOnlyTest(unittest.TestCase):
+    """Which diffs may skip the AI review as formatting-only."""
+
+    def setUp(self):
+        self.chunker = DiffChunker()
+
+    def test_dart_reindent_is_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            " void main() {",
+            "-runApp(const App());",
+            "+  runApp(const App());",
+            " }",
+        )
+        self.assertTrue(self.chunker.is_whitespace_only(diff))
+
+    def test_dart_reflow_is_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            "-  final total = price * quantity;",
+            "+  final total =",
+            "+      price * quantity;",
+        )
+        self.assertTrue(self.chunker.is_whitespace_only(diff))
+
+    def test_missing_final_newline_is_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            "-}",
+            "\\ No newline at end of file",
+            "+}",
+        )
+        self.assertTrue(self.chunker.is_whitespace_only(diff))
+
+    def test_token_change_is_not_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            "-  runApp(const App());",
+            "+  runApp(App());",
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_yaml_reindent_is_not_whitespace_only(self):
+        # Moves http under flutter: indentation is structure in YAML
+        diff = file_diff(
+            "pubspec.yaml",
+            " dependencies:",
+            "   flutter:",
+            "     sdk: flutter",
+            "-  http: ^1.2.0",
+            "+    http: ^1.2.0",
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_makefile_and_arb_are_not_whitespace_only(self):
+        for path in ("Makefile", "lib/l10n/app_en.arb"):
+            diff = file_diff(path, '-  "title": "Home"', '+    "title": "Home"')
+            with self.subTest(path=path):
+                self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_spacing_inside_string_literal_is_not_whitespace_only(self):
+        for old, new in (("'a b'", "'a  b'"), ('"a b"', '"a  b"'), ("'a b'", "'a'  'b'")):
+            diff = file_diff("lib/main.dart", f"-  print({old});", f"+  print({new});")
+            with self.subTest(old=old, new=new):
+                self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_multiline_string_is_not_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            "-  const sql = '''",
+            "-SELECT *",
+            "+  const sql =",
+            "+      '''",
+            "+  SELECT *",
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_reindented_comment_is_whitespace_only(self):
+        diff = file_diff(
+            "lib/main.dart",
+            "-// Don't block the UI thread",
+            "-runApp(app);",
+            "+  // Don't  block the UI thread",
+            "+  runApp(app);",
+        )
+        self.assertTrue(self.chunker.is_whitespace_only(diff))
+
+    def test_joining_code_onto_comment_line_is_not_whitespace_only(self):
+        # Comments out the foo() call
+        diff = file_diff(
+            "lib/main.dart",
+            "-  // note",
+            "-  foo();",
+            "+  // note foo();",
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_splitting_code_out_of_comment_is_not_whitespace_only(self):
+        # Brings the foo() call back from the comment
+        diff = file_diff(
+            "lib/main.dart",
+            "-  // note foo();",
+            "+  // note",
+            "+  foo();",
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_opening_block_comment_is_not_whitespace_only(self):
+        diff = file_diff("lib/main.dart", "-  a / *b;", "+  a /*b;")
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_rename_only_is_not_whitespace_only(self):
+        diff = "\n".join([
+            "diff --git a/lib/old.dart b/lib/new.dart",
+            "similarity index 100%",
+            "rename from lib/old.dart",
+            "rename to lib/new.dart",
+            "",
+        ])
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_rename_with_reindent_is_not_whitespace_only(self):
+        diff = file_diff(
+            "lib/new.dart",
+            "-runApp(const App());",
+            "+  runApp(const App());",
+            header=("similarity index 98%", "rename from lib/old.dart", "rename to lib/new.dart"),
+        )
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_mode_only_is_not_whitespace_only(self):
+        diff = "\n".join([
+            "diff --git a/tool/build.dart b/tool/build.dart",
+            "old mode 100644",
+            "new mode 100755",
+            "",
+        ])
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_new_empty_file_is_not_whitespace_only(self):
+        diff = "\n".join([
+            "diff --git a/lib/empty.dart b/lib/empty.dart",
+            "new file mode 100644",
+            "index 0000000..e69de29",
+            "",
+        ])
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_file_without_hunk_next_to_reindent_is_not_whitespace_only(self):
+        diff = file_diff("lib/main.dart", "-runApp(app);", "+  runApp(app);") + "\n".join([
+            "diff --git a/tool/build.dart b/tool/build.dart",
+            "old mode 100644",
+            "new mode 100755",
+            "",
+        ])
+        self.assertFalse(self.chunker.is_whitespace_only(diff))
+
+    def test_empty_diff_is_not_whitespace_only(self):
+        self.assertFalse(self.chunker.is_whitespace_only(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Tests for splitting long reviews into GitHub comments."""
+
+import unittest
+
+from reviewer.github_client import GitHubClient
+
+
+def content_lines(chunks):
+    """Non-blank lines of all chunks, in order."""
+    return [line for chunk in chunks for line in chunk.split("\n") if line.strip()]
+
+
+class SplitReviewIntoChunksTest(unittest.TestCase):
+    """How _split_review_into_chunks cuts a review into comment parts."""
+
+    def setUp(self):
+        self.client = GitHubClient("owner/repo", "token")
+        self.addCleanup(self.client.close)
+
+    def test_short_review_is_one_chunk(self):
+        self.assertEqual(self.client._split_review_into_chunks("## Summary\nAll good\n", 1000),
+                         ["## Summary\nAll good"])
+
+    def test_chunks_stay_near_limit_and_keep_all_lines(self):
+        lines = []
+        for section in range(20):
+            lines.append(f"## File {section}")
+            lines += [f"- 🔴 Issue {section}.{i}: " + "x" * 40 for i in range(5)]
+            lines.append("")
+        text = "\n".join(lines)
+        limit = 400
+        longest_line = max(len(line) for line in lines)
+
+        chunks = self.client._split_review_into_chunks(text, limit)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), limit + longest_line + 1)
+            self.assertEqual(chunk, chunk.strip())
+        self.assertEqual(content_lines(chunks), [line for line in lines if line.strip()])
+
+    def test_whitespace_only_tail_adds_no_chunk(self):
+        text = "## Summary\n" + "a" * 50 + "\n" + " \n" * 100
+        self.assertEqual(self.client._split_review_into_chunks(text, 60),
+                         ["## Summary\n" + "a" * 50])
+
+
+if __name__ == "__main__":
+    unittest.main()
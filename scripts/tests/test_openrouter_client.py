@@ -0,0 +1,75 @@
+"""Tests for the per-model circuit breaker of OpenRouterClient."""
+
+import unittest
+from unittest import mock
+
+from reviewer.config import Config
+from reviewer.openrouter_client import _CircuitBreaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """CLOSED -> OPEN -> HALF-OPEN -> CLOSED/OPEN transitions."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("reviewer.openrouter_client.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name, value in (("CIRCUIT_BREAKER_FAILURES", 2), ("CIRCUIT_BREAKER_COOLDOWN", 60)):
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = _CircuitBreaker()
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_stays_closed_below_failure_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+    def test_opens_at_threshold_until_cooldown(self):
+        self.open_breaker()
+        self.assertFalse(self.breaker.allow())
+        self.now += 59
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_lets_a_single_probe_through(self):
+        self.open_breaker()
+        self.now += 60
+        self.assertTrue(self.breaker.allow())
+        # Other requests wait for the probe's outcome
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_probe_closes(self):
+        self.open_breaker()
+        self.now += 60
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+        # Counting starts over: one failure doesn't re-open it
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_for_another_cooldown(self):
+        self.open_breaker()
+        self.now += 60
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+        self.now += 59
+        self.assertFalse(self.breaker.allow())
+        self.now += 1
+        self.assertTrue(self.breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for PromptBuilder's smart diff truncation."""
+
+import contextlib
+import io
+import unittest
+
+from reviewer.prompt_builder import PromptBuilder
+from tests.test_diff_chunker import multi_hunk_file_diff, sized_file_diff
+
+
+class TruncateDiffSmartlyTest(unittest.TestCase):
+    """How an over-long diff is cut before it goes into a single prompt."""
+
+    def setUp(self):
+        self.builder = PromptBuilder("english")
+        # Truncation logs what it cut; keep it out of the test output
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def test_diff_within_limit_is_unchanged(self):
+        diff = sized_file_diff("lib/a.dart", 300)
+        self.assertEqual(self.builder._truncate_diff_smartly(diff, 300), (diff, False))
+
+    def test_cut_after_last_complete_file_notes_omitted_files(self):
+        files = [sized_file_diff(f"lib/f{i}.dart", 200) for i in range(4)]
+        truncated, was_truncated = self.builder._truncate_diff_smartly("".join(files), 500)
+
+        self.assertTrue(was_truncated)
+        self.assertEqual(
+            truncated,
+            ("".join(files[:2])).rstrip() + "\n\n... (2 file(s) truncated)"
+        )
+
+    def test_first_file_that_does_not_fit_keeps_whole_hunks(self):
+        complete = sized_file_diff("lib/a.dart", 200)
+        header, hunks = multi_hunk_file_diff("lib/b.dart", 3, 150)
+        diff = complete + header + "".join(hunks) + sized_file_diff("lib/c.dart", 200)
+        budget = len(complete) + len(header) + 2 * 150 + 20
+
+        truncated, was_truncated = self.builder._truncate_diff_smartly(diff, budget)
+
+        self.assertTrue(was_truncated)
+        # Two of b.dart's hunks fit; c.dart is left out
+        self.assertEqual(
+            truncated,
+            (complete + header + "".join(hunks[:2])).rstrip() + "\n\n... (1 file(s) truncated)"
+        )
+
+    def test_no_note_when_only_part_of_the_last_file_is_cut(self):
+        complete = sized_file_diff("lib/a.dart", 200)
+        header, hunks = multi_hunk_file_diff("lib/b.dart", 3, 150)
+        diff = complete + header + "".join(hunks)
+
+        truncated, _ = self.builder._truncate_diff_smartly(diff, len(diff) - 10)
+
+        self.assertEqual(truncated, (complete + header + "".join(hunks[:2])).rstrip())
+        self.assertNotIn("truncated)", truncated)
+
+    def test_first_file_without_a_fitting_hunk_is_cut_at_max_length(self):
+        diff = sized_file_diff("lib/a.dart", 1000) + sized_file_diff("lib/b.dart", 200)
+        self.assertEqual(self.builder._truncate_diff_smartly(diff, 400), (diff[:400], True))
+
+
+if __name__ == "__main__":
+    unittest.main()
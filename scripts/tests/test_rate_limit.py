@@ -0,0 +1,57 @@
+"""Tests for TokenBucket."""
+
+import unittest
+from unittest import mock
+
+from reviewer.rate_limit import TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Burst allowance and pacing of acquire()."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        for target, replacement in (("monotonic", lambda: self.now), ("sleep", sleep)):
+            patcher = mock.patch(f"reviewer.rate_limit.time.{target}", replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_burst_passes_then_requests_are_paced(self):
+        bucket = TokenBucket(per_minute=60, burst=2)  # one token per second
+        for _ in range(4):
+            bucket.acquire()
+        self.assertEqual(len(self.sleeps), 2)
+        for seconds in self.sleeps:
+            self.assertAlmostEqual(seconds, 1.0)
+
+    def test_tokens_refill_over_time(self):
+        bucket = TokenBucket(per_minute=60, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.now += 2
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.sleeps, [])
+
+    def test_refill_is_capped_at_burst(self):
+        bucket = TokenBucket(per_minute=60, burst=2)
+        self.now += 100
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_zero_rate_disables_limiting(self):
+        bucket = TokenBucket(per_minute=0, burst=1)
+        for _ in range(10):
+            bucket.acquire()
+        self.assertEqual(self.sleeps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
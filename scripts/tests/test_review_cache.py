@@ -0,0 +1,83 @@
+"""Tests for ReviewCache."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from reviewer.config import Config
+from reviewer.review_cache import ReviewCache
+
+
+class ReviewCacheTest(unittest.TestCase):
+    """Storing, finding and expiring cached reviews."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache = ReviewCache(self.cache_dir, ttl=3600)
+
+    def age(self, name, seconds):
+        """Backdate a file in the cache directory."""
+        path = os.path.join(self.cache_dir, name)
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    def test_put_then_get_returns_review(self):
+        self.cache.put("prefix+diff", "🔴 Review text", Config.OPENROUTER_MODEL)
+        self.assertEqual(self.cache.get("prefix+diff"), "🔴 Review text")
+        self.assertIsNone(self.cache.get("other diff"))
+
+    def test_review_from_fallback_model_is_found(self):
+        with mock.patch.object(Config, "OPENROUTER_FALLBACK_MODELS", ("fallback/model",)):
+            self.cache.put("diff", "fallback review", "fallback/model")
+            self.assertEqual(self.cache.get("diff"), "fallback review")
+        # Not part of the chain any more: not reused
+        with mock.patch.object(Config, "OPENROUTER_FALLBACK_MODELS", ()):
+            self.assertIsNone(self.cache.get("diff"))
+
+    def test_configured_model_is_preferred(self):
+        with mock.patch.object(Config, "OPENROUTER_FALLBACK_MODELS", ("fallback/model",)):
+            self.cache.put("diff", "fallback review", "fallback/model")
+            self.cache.put("diff", "primary review", Config.OPENROUTER_MODEL)
+            self.assertEqual(self.cache.get("diff"), "primary review")
+
+    def test_language_is_part_of_the_key(self):
+        self.cache.put("diff", "review", Config.OPENROUTER_MODEL)
+        with mock.patch.object(Config, "REVIEW_LANGUAGE", "english"):
+            self.assertIsNone(self.cache.get("diff"))
+
+    def test_expired_entry_is_a_miss(self):
+        self.cache.put("diff", "review", Config.OPENROUTER_MODEL)
+        (name,) = os.listdir(self.cache_dir)
+        self.age(name, 7200)
+        self.assertIsNone(self.cache.get("diff"))
+
+    def test_zero_ttl_disables_cache(self):
+        cache = ReviewCache(self.cache_dir, ttl=0)
+        cache.put("diff", "review", Config.OPENROUTER_MODEL)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertIsNone(cache.get("diff"))
+
+    def test_prune_deletes_only_expired_cache_files(self):
+        self.cache.put("fresh", "review", Config.OPENROUTER_MODEL)
+        (fresh,) = os.listdir(self.cache_dir)
+        expired = "a" * 64 + ".md"
+        leftover_tmp = "tmpabcd_123.tmp"
+        unrelated = ["notes.md", "build.log", "b" * 63 + ".md"]
+        for name in [expired, leftover_tmp, *unrelated]:
+            open(os.path.join(self.cache_dir, name), "w").close()
+            self.age(name, 7200)
+
+        self.cache.prune()
+
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted([fresh, *unrelated]))
+
+    def test_prune_without_cache_directory_is_a_no_op(self):
+        ReviewCache(os.path.join(self.cache_dir, "missing"), ttl=3600).prune()
+
+
+if __name__ == "__main__":
+    unittest.main()